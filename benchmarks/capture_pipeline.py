@@ -0,0 +1,217 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Measure the cost of capturing debug for many failing tests.
+
+Runs thousands of failing tests in a new process with ``--driver remote``
+against a fake WebDriver server, with realistic screenshot, page source,
+browser log, and driver log sizes, and writes an HTML report. Reports the
+throughput, peak RSS of the test process, and the size of the report and any
+stored artifacts. Exits with an error if the peak RSS exceeds ``--max-rss-mb``
+or the throughput is below ``--min-tests-per-second``.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from testing.fake_webdriver import FakeWebDriver  # noqa: E402
+
+CONFTEST = """
+import pytest
+from selenium.webdriver import Remote
+from selenium.webdriver.remote.command import Command
+
+DRIVER_LOG = "driver log line\\n" * ({driver_log_bytes} // 16)
+
+
+class LoggingRemote(Remote):
+    # remote drivers no longer implement logs, but the fake server does
+
+    @property
+    def log_types(self):
+        return self.execute(Command.GET_AVAILABLE_LOG_TYPES)["value"]
+
+    def get_log(self, log_type):
+        return self.execute(Command.GET_LOG, {{"type": log_type}})["value"]
+
+
+@pytest.fixture(scope="session")
+def driver_class():
+    return LoggingRemote
+
+
+@pytest.fixture
+def driver_log(driver_log):
+    with open(driver_log, "w") as f:
+        f.write(DRIVER_LOG)
+    return driver_log
+"""
+
+TESTS = """
+import pytest
+
+@pytest.mark.nondestructive
+@pytest.mark.parametrize("i", range({count}))
+def test_capture(selenium, i):
+    assert False
+"""
+
+# run pytest, and write the peak RSS of the process to the given path
+RUNNER = """
+import sys
+
+import pytest
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+path = sys.argv[1]
+pytest.main(sys.argv[2:])
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+with open(path, "w") as f:
+    # the peak RSS is in bytes on macOS and in kilobytes elsewhere
+    f.write(str(rss if sys.platform == "darwin" else rss * 1024))
+"""
+
+SCENARIOS = {
+    "embedded": {},
+    "artifacts": {"selenium_artifact_dir": "artifacts"},
+    "dedup": {"selenium_artifact_dir": "artifacts", "selenium_artifact_dedup": "true"},
+}
+
+
+def directory_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, dirs, files in os.walk(path)
+        for name in files
+    )
+
+
+def run(server, name, args):
+    directory = tempfile.mkdtemp(prefix="pytest-selenium-benchmark-")
+    with open(os.path.join(directory, "conftest.py"), "w") as f:
+        f.write(CONFTEST.format(driver_log_bytes=args.driver_log_bytes))
+    with open(os.path.join(directory, "test_{0}.py".format(name)), "w") as f:
+        f.write(TESTS.format(count=args.tests))
+    report = os.path.join(directory, "report.html")
+    rss = os.path.join(directory, "rss")
+    command = [
+        sys.executable,
+        "-c",
+        RUNNER,
+        rss,
+        "-q",
+        "-p",
+        "no:cacheprovider",
+        "--rootdir",
+        directory,
+        "--driver",
+        "remote",
+        "--selenium-host",
+        server.host,
+        "--selenium-port",
+        str(server.port),
+        "--capability",
+        "browserName",
+        "firefox",
+        "--html",
+        report,
+        "--self-contained-html",
+    ]
+    for option, value in SCENARIOS[name].items():
+        if option == "selenium_artifact_dir":
+            value = os.path.join(directory, value)
+        command.extend(["-o", "{0}={1}".format(option, value)])
+    start = time.perf_counter()
+    subprocess.run(command, cwd=directory, stdout=subprocess.DEVNULL)
+    duration = time.perf_counter() - start
+    artifacts = os.path.join(directory, "artifacts")
+    with open(rss) as f:
+        peak_rss = int(f.read())
+    result = {
+        "seconds": duration,
+        "peak_rss_bytes": peak_rss,
+        "tests_per_second": args.tests / duration,
+        "report_bytes": os.path.getsize(report),
+        "artifact_bytes": directory_size(artifacts),
+    }
+    shutil.rmtree(directory, ignore_errors=True)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=1000)
+    parser.add_argument("--screenshot-bytes", type=int, default=2 * 1024 * 1024)
+    parser.add_argument("--page-bytes", type=int, default=200 * 1024)
+    parser.add_argument("--log-entries", type=int, default=200)
+    parser.add_argument("--driver-log-bytes", type=int, default=256 * 1024)
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), default=[]
+    )
+    parser.add_argument("--json", help="path to write the results to as JSON")
+    parser.add_argument("--max-rss-mb", type=float, default=0)
+    parser.add_argument("--min-tests-per-second", type=float, default=0)
+    args = parser.parse_args()
+
+    results = {}
+    with FakeWebDriver(
+        screenshot_bytes=args.screenshot_bytes,
+        page_bytes=args.page_bytes,
+        log_entries=args.log_entries,
+    ) as server:
+        for name in args.scenario or sorted(SCENARIOS):
+            results[name] = run(server, name, args)
+
+    print(
+        "{0:<10} {1:>9} {2:>9} {3:>10} {4:>10} {5:>10}".format(
+            "scenario", "seconds", "tests/s", "peak RSS", "report", "artifacts"
+        )
+    )
+    for name, result in results.items():
+        print(
+            "{0:<10} {1:>9.1f} {2:>9.1f} {3:>8.0f}MB {4:>8.1f}MB {5:>8.1f}MB".format(
+                name,
+                result["seconds"],
+                result["tests_per_second"],
+                result["peak_rss_bytes"] / 2.0**20,
+                result["report_bytes"] / 2.0**20,
+                result["artifact_bytes"] / 2.0**20,
+            )
+        )
+    print("{0} failing tests for each scenario".format(args.tests))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    for name, result in results.items():
+        rss = result["peak_rss_bytes"]
+        if args.max_rss_mb and rss > args.max_rss_mb * 2**20:
+            sys.exit(
+                "The {0} scenario used {1:.0f}MB, exceeding {2:.0f}MB".format(
+                    name, rss / 2.0**20, args.max_rss_mb
+                )
+            )
+        if result["tests_per_second"] < args.min_tests_per_second:
+            sys.exit(
+                "The {0} scenario ran {1:.1f} tests per second, below "
+                "{2:.1f}".format(
+                    name, result["tests_per_second"], args.min_tests_per_second
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
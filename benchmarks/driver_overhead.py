@@ -0,0 +1,155 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Measure the overhead pytest-selenium adds to each test.
+
+Runs generated tests with ``--driver remote`` against a fake WebDriver server,
+so that no browser or network is needed, and reports the median and 90th
+percentile of the fixture setup, debug capture, and teardown time of each
+test. Use ``--latency`` to simulate a remote grid. Exits with an error if the
+median setup and teardown time of a test exceeds ``--max-ms``.
+"""
+
+import argparse
+from collections import defaultdict
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+
+import pytest
+from pytest_selenium.timing import percentile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from testing.fake_webdriver import FakeWebDriver  # noqa: E402
+
+TESTS = """
+import pytest
+
+@pytest.mark.nondestructive
+@pytest.mark.parametrize("i", range({count}))
+def test_overhead(selenium, i):
+    selenium.get("http://www.example.com")
+    assert {passed}
+"""
+
+SCENARIOS = {
+    "fixture": {"passed": True, "ini": {}},
+    "pooled": {"passed": True, "ini": {"selenium_driver_pool_size": "1"}},
+    "capture": {"passed": False, "ini": {}},
+}
+
+
+class Durations(object):
+    def __init__(self):
+        self.phases = defaultdict(list)
+
+    def pytest_runtest_logreport(self, report):
+        self.phases[report.when].append(report.duration)
+
+
+def run(server, name, count):
+    scenario = SCENARIOS[name]
+    directory = tempfile.mkdtemp(prefix="pytest-selenium-benchmark-")
+    # each scenario is run in this process, so needs its own module name
+    path = os.path.join(directory, "test_{0}.py".format(name))
+    with open(path, "w") as f:
+        f.write(TESTS.format(count=count, passed=scenario["passed"]))
+    timings = os.path.join(directory, "timings.json")
+    ini = dict(scenario["ini"], selenium_timings_json=timings)
+    args = [
+        "-q",
+        "-p",
+        "no:cacheprovider",
+        "--rootdir",
+        directory,
+        "--driver",
+        "remote",
+        "--selenium-host",
+        server.host,
+        "--selenium-port",
+        str(server.port),
+        "--capability",
+        "browserName",
+        "firefox",
+    ]
+    for option, value in ini.items():
+        args.extend(["-o", "{0}={1}".format(option, value)])
+    durations = Durations()
+    pytest.main(args + [path], plugins=[durations])
+    with open(timings) as f:
+        phases = json.load(f)["phases"]
+    shutil.rmtree(directory, ignore_errors=True)
+    # debug is captured while making the report, outside of the test duration
+    capture = [0.0] * count
+    for name, phase in phases.items():
+        if name.startswith("gather_"):
+            for index, duration in enumerate(phase["samples"][:count]):
+                capture[index] += duration
+    return {
+        "setup": durations.phases["setup"],
+        "capture": capture,
+        "teardown": durations.phases["teardown"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=50)
+    parser.add_argument(
+        "--latency", type=float, default=0, help="latency of each command in ms"
+    )
+    parser.add_argument("--screenshot-bytes", type=int, default=100 * 1024)
+    parser.add_argument("--page-bytes", type=int, default=50 * 1024)
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), default=[]
+    )
+    parser.add_argument("--max-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    results = {}
+    with FakeWebDriver(
+        latency=args.latency / 1000.0,
+        screenshot_bytes=args.screenshot_bytes,
+        page_bytes=args.page_bytes,
+    ) as server:
+        for name in args.scenario or sorted(SCENARIOS):
+            results[name] = run(server, name, args.tests)
+
+    print(
+        "{0:<10} {1:>14} {2:>14} {3:>14}".format(
+            "scenario", "setup", "capture", "teardown"
+        )
+    )
+    for name, phases in results.items():
+        print(
+            "{0:<10}".format(name)
+            + "".join(
+                " {0:>6.1f}/{1:>5.1f}ms".format(
+                    statistics.median(phases[phase]) * 1000,
+                    percentile(sorted(phases[phase]), 90) * 1000,
+                )
+                for phase in ("setup", "capture", "teardown")
+            )
+        )
+    print("median/p90 for each of {0} tests".format(args.tests))
+
+    if args.max_ms:
+        for name, phases in results.items():
+            overhead = (
+                statistics.median(phases["setup"])
+                + statistics.median(phases["teardown"])
+            ) * 1000
+            if overhead > args.max_ms:
+                sys.exit(
+                    "The {0} scenario takes {1:.1f}ms per test, exceeding "
+                    "{2:.0f}ms".format(name, overhead, args.max_ms)
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Measure how long it takes to load the plugins of pytest-selenium.
+
+Loads every ``pytest11`` entry point of pytest-selenium in a new interpreter
+several times, and reports the median time added to importing pytest. Exits
+with an error if it exceeds ``--max-ms``, which by default allows about twice
+the time it takes without importing selenium, so that importing selenium or
+requests when loading the plugin fails.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+BASELINE = "import pytest"
+
+LOAD_PLUGINS = """
+import pytest
+from importlib.metadata import entry_points
+
+plugins = entry_points()
+if hasattr(plugins, "select"):
+    plugins = plugins.select(group="pytest11")
+else:
+    plugins = plugins.get("pytest11", [])
+for plugin in plugins:
+    if plugin.value.startswith("pytest_selenium"):
+        plugin.load()
+"""
+
+
+def measure(code):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--max-ms", type=float, default=100, help="0 disables the limit"
+    )
+    args = parser.parse_args()
+
+    # alternate the runs, so that the load of the machine affects both alike
+    baselines, added = [], []
+    for _ in range(args.runs):
+        baselines.append(measure(BASELINE))
+        added.append(measure(LOAD_PLUGINS) - baselines[-1])
+    baseline = statistics.median(baselines)
+    added = statistics.median(added) * 1000
+    print(
+        "Loading pytest-selenium adds {0:.0f}ms to importing pytest "
+        "({1:.0f}ms)".format(added, baseline * 1000)
+    )
+    if args.max_ms and added > args.max_ms:
+        sys.exit("Loading pytest-selenium exceeds {0:.0f}ms".format(args.max_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Measure the cost of preparing a browser profile for each session.
+
+Generates a base profile with the number and size of files of a profile a
+browser has run with, and compares preparing it for each session by giving it
+to selenium as a Firefox profile, which is copied and sent to the driver as a
+zip file, by copying it, and by cloning a profile template. No browser is
+started, so the work each of these saves the browser on its first run is not
+included. Use ``--directory`` to measure on another filesystem, as templates
+are cloned using copy-on-write where the filesystem supports it. Exits with an
+error if cloning a template is less than ``--min-speedup`` times faster than
+each of the others.
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from selenium.webdriver import FirefoxOptions
+from selenium.webdriver.firefox.firefox_profile import FirefoxProfile
+
+from pytest_selenium.profiles import ProfileTemplates
+from pytest_selenium.timing import percentile
+
+
+def make_profile(path, files, size):
+    # a few large databases, and many small cache and extension files
+    large = size // 2 // 4
+    small = (size - large * 4) // max(files - 4, 1)
+    for index in range(files):
+        directory = (
+            os.path.join(path, "cache2", str(index % 16)) if index >= 4 else path
+        )
+        os.makedirs(directory, exist_ok=True)
+        name = "places{0}.sqlite".format(index) if index < 4 else str(index)
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(os.urandom(large if index < 4 else small))
+
+
+def firefox_profile(base, templates):
+    profile = FirefoxProfile(base)
+    profile.encoded
+    shutil.rmtree(os.path.dirname(profile.path), ignore_errors=True)
+
+
+def copy(base, templates):
+    path = tempfile.mkdtemp(dir=templates.sessions_dir)
+    shutil.copytree(base, path, symlinks=True, dirs_exist_ok=True)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def template(base, templates):
+    kwargs, path = templates.prepare("Firefox", {"options": FirefoxOptions()})
+    shutil.rmtree(path, ignore_errors=True)
+
+
+SCENARIOS = {"firefox_profile": firefox_profile, "copy": copy, "template": template}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--megabytes", type=float, default=20)
+    parser.add_argument("--directory", help="directory to create profiles in")
+    parser.add_argument("--min-speedup", type=float, default=0)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(
+        prefix="pytest-selenium-benchmark-", dir=args.directory
+    )
+    try:
+        base = os.path.join(directory, "base")
+        make_profile(base, args.files, int(args.megabytes * 1024 * 1024))
+        templates = ProfileTemplates(os.path.join(directory, "profiles"), firefox=base)
+        start = time.perf_counter()
+        templates.template("firefox", {})
+        built = time.perf_counter() - start
+        results = {}
+        for name, prepare in SCENARIOS.items():
+            durations = []
+            for _ in range(args.sessions):
+                start = time.perf_counter()
+                prepare(base, templates)
+                durations.append(time.perf_counter() - start)
+            results[name] = sorted(durations)
+        reflinked = templates.reflinked > 0
+        templates.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print("{0:<16} {1:>10} {2:>10}".format("scenario", "median", "p90"))
+    for name, durations in results.items():
+        print(
+            "{0:<16} {1:>8.1f}ms {2:>8.1f}ms".format(
+                name,
+                statistics.median(durations) * 1000,
+                percentile(durations, 90) * 1000,
+            )
+        )
+    print(
+        "for each of {0} sessions with a profile of {1} files and {2:g}MB, after "
+        "building the template in {3:.1f}ms{4}".format(
+            args.sessions,
+            args.files,
+            args.megabytes,
+            built * 1000,
+            ", using copy-on-write" if reflinked else "",
+        )
+    )
+
+    if args.min_speedup:
+        cloned = statistics.median(results["template"])
+        for name, durations in results.items():
+            speedup = statistics.median(durations) / cloned
+            if name != "template" and speedup < args.min_speedup:
+                sys.exit(
+                    "Cloning a template is {0:.1f} times faster than {1}, less "
+                    "than {2:g}".format(speedup, name, args.min_speedup)
+                )
+
+
+if __name__ == "__main__":
+    main()
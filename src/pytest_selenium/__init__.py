@@ -1 +1,2 @@
 from .pytest_selenium import *  # noqa
+from .pytest_selenium import __getattr__  # noqa
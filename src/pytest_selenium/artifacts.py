@@ -0,0 +1,176 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from collections import deque
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+
+from .exceptions import ArtifactQuotaExceededError
+
+LOGGER = logging.getLogger(__name__)
+
+EVICTION_POLICIES = ("oldest", "none")
+
+
+def parse_size(value):
+    """Return the number of bytes in a size such as 512, 100K, 10M, or 1G"""
+    match = re.match(r"^\s*(\d+)\s*([KMG]?)B?\s*$", str(value), re.IGNORECASE)
+    if match is None:
+        raise ValueError("Invalid size: {0}".format(value))
+    number, unit = match.groups()
+    return int(number) * 1024 ** " KMG".index(unit.upper() or " ")
+
+
+def slugify(nodeid):
+    """Return a string usable in file names for a node id"""
+    return re.sub(r"[^\w.-]+", "_", nodeid).strip("_")
+
+
+def artifact_name(item, report, name, extension):
+    """Return a file name for an artifact of the given test phase"""
+    return "{0}-{1}-{2}.{3}".format(slugify(item.nodeid), report.when, name, extension)
+
+
+class ArtifactStore(object):
+    """Store debug artifacts as files instead of in the report.
+
+    Artifacts are written to ``directory``, and referenced from the report
+    by a link relative to ``link_base``, or by a URL starting with ``url``.
+    When ``quota`` bytes have been written by this process, the ``oldest``
+    eviction policy removes the oldest artifacts to make room, and the
+    ``none`` policy refuses to store any more artifacts.
+
+    With ``dedup`` enabled, artifacts are stored once under the hash of their
+    content, and identical artifacts refer to the same file.
+    """
+
+    def __init__(
+        self,
+        directory,
+        quota=0,
+        eviction="oldest",
+        link_base=None,
+        url=None,
+        dedup=False,
+    ):
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError("Invalid eviction policy: {0}".format(eviction))
+        self.directory = os.path.abspath(directory)
+        self.quota = quota
+        self.eviction = eviction
+        self.link_base = link_base
+        self.url = url
+        self.dedup = dedup
+        self.size = 0
+        self.stored = 0
+        self.duplicates = 0
+        self.saved = 0
+        self._files = deque()
+        self._objects = set()
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def write(self, name, data):
+        """Write data to the named artifact and return its path
+
+        Data can be bytes, a string, or an iterable of bytes or strings, which
+        is written as it is consumed.
+        """
+        if self.dedup:
+            if isinstance(data, (bytes, str)):
+                data = [data]
+            return self._write_object(name, (_encode(chunk) for chunk in data))
+        path = os.path.join(self.directory, name)
+        if isinstance(data, bytes):
+            self._reserve(len(data))
+            with open(path, "wb") as f:
+                f.write(data)
+            return self._add(path, len(data))
+        if isinstance(data, str):
+            data = [data]
+        with open(path, "wb") as f:
+            for chunk in data:
+                f.write(_encode(chunk))
+        return self._commit(path)
+
+    def link(self, path):
+        """Return a link to the artifact for use in the report"""
+        relative = os.path.relpath(path, self.directory).replace(os.sep, "/")
+        if self.url:
+            return "{0}/{1}".format(self.url.rstrip("/"), relative)
+        if self.link_base:
+            return os.path.relpath(path, self.link_base).replace(os.sep, "/")
+        return path
+
+    def _reserve(self, size):
+        with self._lock:
+            if self.quota and self.size + size > self.quota:
+                if self.eviction == "none" or size > self.quota:
+                    raise ArtifactQuotaExceededError(self.quota)
+                while self._files and self.size + size > self.quota:
+                    path, evicted = self._files.popleft()
+                    LOGGER.info("Evicting artifact {0}".format(path))
+                    self._objects.discard(path)
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass  # the artifact has already been removed
+                    self.size -= evicted
+            self.size += size
+
+    def _write_object(self, name, chunks):
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                digest.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+        key = digest.hexdigest()
+        path = os.path.join(
+            self.directory, "objects", key[:2], key[2:] + os.path.splitext(name)[1]
+        )
+        with self._lock:
+            exists = path in self._objects or os.path.exists(path)
+            if exists:
+                self.duplicates += 1
+                self.saved += size
+        if exists:
+            os.remove(temp)
+            return path
+        try:
+            self._reserve(size)
+        except ArtifactQuotaExceededError:
+            os.remove(temp)
+            raise
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # replace atomically, as other processes may store the same content
+        os.replace(temp, path)
+        with self._lock:
+            self._objects.add(path)
+            self.stored += 1
+        return self._add(path, size)
+
+    def _commit(self, path):
+        size = os.path.getsize(path)
+        try:
+            self._reserve(size)
+        except ArtifactQuotaExceededError:
+            os.remove(path)
+            raise
+        return self._add(path, size)
+
+    def _add(self, path, size):
+        with self._lock:
+            self._files.append((path, size))
+        return path
+
+
+def _encode(chunk):
+    return chunk if isinstance(chunk, bytes) else chunk.encode("utf-8")
@@ -2,8 +2,9 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+from functools import partial
+
 import pytest
-from selenium.webdriver.common.options import ArgOptions
 
 from pytest_selenium.drivers.cloud import Provider
 from pytest_selenium.exceptions import MissingCloudSettingError
@@ -59,11 +60,8 @@ def pytest_selenium_runtest_makereport(item, report, summary, extra):
     session_id = item._driver.session_id
     api_url = provider.API.format(session=session_id)
 
-    # lazy import requests for projects that don't need requests
-    import requests
-
     try:
-        job_info = requests.get(api_url, auth=provider.auth, timeout=10).json()
+        job_info = provider.get_job_info(item, api_url)
         job_url = job_info["automation_session"][provider.job_access]
         # Add the job URL to the summary
         summary.append("{0} Job: {1}".format(provider.name, job_url))
@@ -75,26 +73,48 @@ def pytest_selenium_runtest_makereport(item, report, summary, extra):
             "WARNING: Failed to determine {0} job URL: {1}".format(provider.name, e)
         )
 
+    status = "running" if passed else "error"
+    if report.when == "teardown" and passed:
+        status = "completed"
+    sync = getattr(item.config, "_selenium_status_sync", None)
+    if sync is not None:
+        sync.update(
+            api_url,
+            provider.name,
+            status == "error",
+            partial(_update_status, item.config, provider, api_url, status),
+            lambda: _get_status(item, provider, api_url) == "error",
+        )
+        return
+
     try:
         # Update the job result
         job_status = job_info["automation_session"]["status"]
-        status = "running" if passed else "error"
-        if report.when == "teardown" and passed:
-            status = "completed"
         if job_status not in ("error", status):
             # Only update the result if it's not already marked as failed
-            requests.put(
-                api_url,
-                headers={"Content-Type": "application/json"},
-                params={"status": status},
-                auth=provider.auth,
-                timeout=10,
-            )
+            _update_status(item.config, provider, api_url, status)
+            job_info["automation_session"]["status"] = status
     except Exception as e:
         summary.append("WARNING: Failed to update job status: {0}".format(e))
 
 
+def _get_status(item, provider, api_url):
+    return provider.get_job_info(item, api_url)["automation_session"]["status"]
+
+
+def _update_status(config, provider, api_url, status):
+    provider.http_session(config).put(
+        api_url,
+        headers={"Content-Type": "application/json"},
+        params={"status": status},
+        auth=provider.auth,
+        timeout=10,
+    )
+
+
 def driver_kwargs(test, capabilities, **kwargs):
+    from selenium.webdriver.common.options import ArgOptions
+
     provider = BrowserStack()
     assert provider.job_access
     options = ArgOptions()
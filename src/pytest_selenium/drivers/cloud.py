@@ -4,13 +4,69 @@
 
 import os
 import configparser
+from functools import partial
+import threading
 
+from pytest_selenium import timing
 from pytest_selenium.exceptions import (
     MissingCloudCredentialError,
     MissingCloudSettingError,
     InvalidCloudSettingError,
 )
 
+_http_sessions = {}
+_http_sessions_lock = threading.Lock()
+_settings = {}
+_settings_lock = threading.Lock()
+
+
+def clear_settings_cache():
+    """Forget the provider settings read from configuration files"""
+    with _settings_lock:
+        _settings.clear()
+
+
+def get_http_session(config, name):
+    """Return a keep-alive HTTP session shared by every request to a provider"""
+    with _http_sessions_lock:
+        session = _http_sessions.get(name)
+        if session is None:
+            # lazy import requests for projects that don't need requests
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            size = int(config.getini("selenium_http_pool_size"))
+            retries = Retry(
+                total=int(config.getini("selenium_http_retries")),
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=size, pool_maxsize=size, max_retries=retries
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.hooks["response"].append(
+                partial(_record_timing, config, "{0}_api".format(name.lower()))
+            )
+            _http_sessions[name] = session
+        return session
+
+
+def _record_timing(config, name, response, *args, **kwargs):
+    timing.record(config, name, response.elapsed.total_seconds())
+
+
+def close_http_sessions():
+    """Close the HTTP sessions of every provider"""
+    with _http_sessions_lock:
+        for session in _http_sessions.values():
+            session.close()
+        _http_sessions.clear()
+
 
 class Provider(object):
     @property
@@ -27,8 +83,12 @@ class Provider(object):
 
     @property
     def config(self):
-        config = configparser.ConfigParser()
-        config.read([self.config_name, self.config_file_path])
+        paths = (os.path.abspath(self.config_name), self.config_file_path)
+        with _settings_lock:
+            config = _settings.get(paths)
+            if config is None:
+                config = _settings[paths] = configparser.ConfigParser()
+                config.read(paths)
         return config
 
     def get_credential(self, key, envs):
@@ -38,14 +98,17 @@ class Provider(object):
             raise MissingCloudCredentialError(self.name, key, envs)
 
     def get_setting(self, key, envs, section, allowed_values=None):
-        value = None
+        # the environment is part of the key, as it is cheap to look up
+        cache_key = (
+            os.path.abspath(self.config_name),
+            self.config_file_path,
+            section,
+            key,
+        ) + tuple((env, os.getenv(env)) for env in envs)
         try:
-            value = self.config.get(section, key)
-        except (configparser.NoSectionError, configparser.NoOptionError, KeyError):
-            for env in envs:
-                value = os.getenv(env)
-                if value:
-                    break
+            value = _settings[cache_key]
+        except KeyError:
+            value = _settings[cache_key] = self._read_setting(key, envs, section)
 
         if value is None:
             raise MissingCloudSettingError(self.name, key, envs)
@@ -54,5 +117,31 @@ class Provider(object):
 
         return value
 
+    def http_session(self, config):
+        return get_http_session(config, self.name)
+
+    def get_job_info(self, item, url, refresh=False):
+        """Return the job info at url, retrieving it at most once per test
+        unless refresh is true"""
+        if not hasattr(item, "_selenium_job_info"):
+            item._selenium_job_info = {}
+        if refresh or url not in item._selenium_job_info:
+            response = self.http_session(item.config).get(
+                url, auth=self.auth, timeout=10
+            )
+            item._selenium_job_info[url] = response.json()
+        return item._selenium_job_info[url]
+
+    def _read_setting(self, key, envs, section):
+        try:
+            return self.config.get(section, key)
+        except (configparser.NoSectionError, configparser.NoOptionError, KeyError):
+            value = None
+            for env in envs:
+                value = os.getenv(env)
+                if value:
+                    break
+            return value
+
     def uses_driver(self, driver):
         return driver.lower() == self.name.lower()
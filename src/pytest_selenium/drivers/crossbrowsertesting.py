@@ -2,6 +2,7 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+from functools import partial
 import html
 import pytest
 
@@ -39,18 +40,11 @@ def pytest_selenium_capture_debug(item, report, extra):
     if not provider.uses_driver(item.config.getoption("driver")):
         return
 
-    # lazy import requests for projects that don't need requests
-    import requests
-
-    videos = (
-        requests.get(
-            provider.API.format(session=item._driver.session_id),
-            auth=provider.auth,
-            timeout=10,
-        )
-        .json()
-        .get("videos")
+    # the video may have been added since the job info was first retrieved
+    info = provider.get_job_info(
+        item, provider.API.format(session=item._driver.session_id), refresh=True
     )
+    videos = info.get("videos")
 
     if videos and len(videos) > 0:
         pytest_html = item.config.pluginmanager.getplugin("html")
@@ -65,15 +59,10 @@ def pytest_selenium_runtest_makereport(item, report, summary, extra):
 
     passed = report.passed or (report.failed and hasattr(report, "wasxfail"))
 
-    # lazy import requests for projects that don't need requests
-    import requests
-
     # Add the test URL to the summary
-    info = requests.get(
-        provider.API.format(session=item._driver.session_id),
-        auth=provider.auth,
-        timeout=10,
-    ).json()
+    info = provider.get_job_info(
+        item, provider.API.format(session=item._driver.session_id)
+    )
 
     url = info.get("show_result_public_url")
     summary.append("{0}: {1}".format(provider.name, url))
@@ -81,25 +70,40 @@ def pytest_selenium_runtest_makereport(item, report, summary, extra):
     # Add the job URL to the HTML report
     extra.append(pytest_html.extras.url(url, provider.name))
 
+    score = "pass" if passed else "fail"
+    api_url = provider.API.format(session=info.get("selenium_test_id"))
+    sync = getattr(item.config, "_selenium_status_sync", None)
+    if sync is not None:
+        sync.update(
+            api_url,
+            provider.name,
+            not passed,
+            partial(_update_score, item.config, provider, api_url, score),
+            lambda: info.get("test_score") == "fail",
+            overwrite=report.when == "setup",
+        )
+        return
+
     try:
         # Update the test result
         if report.when == "setup" or info.get("test_score") != "fail":
             # Only update the result if it's not already marked as failed
-            score = "pass" if passed else "fail"
-            data = {"action": "set_score", "score": score}
-            r = requests.put(
-                provider.API.format(session=info.get("selenium_test_id")),
-                data=data,
-                auth=provider.auth,
-                timeout=10,
-            )
-            r.raise_for_status()
+            _update_score(item.config, provider, api_url, score)
+            info["test_score"] = score
     except Exception as e:
         summary.append(
             "WARNING: Failed to update {0} job status: {1}".format(provider.name, e)
         )
 
 
+def _update_score(config, provider, api_url, score):
+    data = {"action": "set_score", "score": score}
+    r = provider.http_session(config).put(
+        api_url, data=data, auth=provider.auth, timeout=10
+    )
+    r.raise_for_status()
+
+
 def driver_kwargs(request, test, capabilities, **kwargs):
     provider = CrossBrowserTesting()
     capabilities.setdefault("name", test)
@@ -2,8 +2,8 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 import pytest
-from selenium.webdriver.edge.options import Options
-from selenium.webdriver.edge.service import Service
+
+from pytest_selenium.services import get_service
 
 
 def driver_kwargs(edge_options, edge_service, **kwargs):
@@ -12,11 +12,19 @@ def driver_kwargs(edge_options, edge_service, **kwargs):
 
 @pytest.fixture
 def edge_options():
+    from selenium.webdriver.edge.options import Options
+
     return Options()
 
 
 @pytest.fixture
-def edge_service(driver_path, driver_args, driver_log):
-    return Service(
-        executable_path=driver_path, service_args=driver_args, log_output=driver_log
+def edge_service(pytestconfig, driver_path, driver_args, driver_log):
+    from selenium.webdriver.edge.service import Service
+
+    return get_service(
+        pytestconfig,
+        Service,
+        executable_path=driver_path,
+        service_args=driver_args,
+        log_output=driver_log,
     )
@@ -5,8 +5,8 @@ import logging
 
 import pytest
 
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.firefox.service import Service
+from pytest_selenium.services import get_service
+from pytest_selenium.utils import marker_signature
 
 LOGGER = logging.getLogger(__name__)
 
@@ -33,21 +33,45 @@ def driver_kwargs(firefox_options, firefox_service, **kwargs):
 
 @pytest.fixture
 def firefox_options(request):
+    from selenium.webdriver.firefox.options import Options
+
     options = Options()
 
-    for arg in get_arguments_from_markers(request.node):
+    arguments, preferences = _get_options_from_markers(request)
+    for arg in arguments:
         options.add_argument(arg)
 
-    for name, value in get_preferences_from_markers(request.node).items():
+    for name, value in preferences:
         options.set_preference(name, value)
 
     return options
 
 
+def _get_options_from_markers(request):
+    # markers are resolved once for each combination of markers
+    key = (
+        "firefox",
+        marker_signature(request.node, "firefox_arguments", "firefox_preferences"),
+    )
+    cache = request.config._selenium_cache
+    if key not in cache:
+        cache[key] = (
+            tuple(get_arguments_from_markers(request.node)),
+            tuple(get_preferences_from_markers(request.node).items()),
+        )
+    return cache[key]
+
+
 @pytest.fixture
-def firefox_service(driver_path, driver_args, driver_log):
-    return Service(
-        executable_path=driver_path, service_args=driver_args, log_output=driver_log
+def firefox_service(pytestconfig, driver_path, driver_args, driver_log):
+    from selenium.webdriver.firefox.service import Service
+
+    return get_service(
+        pytestconfig,
+        Service,
+        executable_path=driver_path,
+        service_args=driver_args,
+        log_output=driver_log,
     )
 
 
@@ -2,8 +2,6 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 import pytest
-from selenium.webdriver.ie.options import Options
-from selenium.webdriver.ie.service import Service
 
 
 def driver_kwargs(ie_options, ie_service, **kwargs):
@@ -12,11 +10,15 @@ def driver_kwargs(ie_options, ie_service, **kwargs):
 
 @pytest.fixture
 def ie_options():
+    from selenium.webdriver.ie.options import Options
+
     return Options()
 
 
 @pytest.fixture
 def ie_service(driver_path, driver_args, driver_log):
+    from selenium.webdriver.ie.service import Service
+
     return Service(
         executable_path=driver_path, service_args=driver_args, log_output=driver_log
     )
@@ -2,8 +2,8 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 import pytest
-from selenium.webdriver.safari.options import Options
-from selenium.webdriver.safari.service import Service
+
+from pytest_selenium.services import get_service
 
 
 def driver_kwargs(safari_options, safari_service, **kwargs):
@@ -15,11 +15,19 @@ def driver_kwargs(safari_options, safari_service, **kwargs):
 
 @pytest.fixture
 def safari_options():
+    from selenium.webdriver.safari.options import Options
+
     return Options()
 
 
 @pytest.fixture
-def safari_service(driver_path, driver_args, driver_log):
-    return Service(
-        executable_path=driver_path, service_args=driver_args, log_output=driver_log
+def safari_service(pytestconfig, driver_path, driver_args, driver_log):
+    from selenium.webdriver.safari.service import Service
+
+    return get_service(
+        pytestconfig,
+        Service,
+        executable_path=driver_path,
+        service_args=driver_args,
+        log_output=driver_log,
     )
@@ -2,11 +2,11 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+from functools import partial
 import os
 import json
 
 import pytest
-from selenium.webdriver.common.options import ArgOptions
 
 from pytest_selenium.drivers.cloud import Provider
 from pytest_selenium.exceptions import MissingCloudSettingError
@@ -79,9 +79,6 @@ def pytest_selenium_runtest_makereport(item, report, summary, extra):
     # Add the job URL to the HTML report
     extra.append(pytest_html.extras.url(job_url, "{0} Job".format(provider.name)))
 
-    # lazy import requests for projects that don't need requests
-    import requests
-
     try:
         # Update the job result
         api_url = provider.API.format(
@@ -89,18 +86,38 @@ def pytest_selenium_runtest_makereport(item, report, summary, extra):
             username=provider.username,
             data_center=provider.data_center,
         )
-        job_info = requests.get(api_url, auth=provider.auth, timeout=10).json()
+        sync = getattr(item.config, "_selenium_status_sync", None)
+        if sync is not None:
+            sync.update(
+                api_url,
+                provider.name,
+                not passed,
+                partial(_update_status, item.config, provider, api_url, passed),
+                lambda: provider.get_job_info(item, api_url).get("passed") is False,
+                overwrite=report.when == "setup",
+            )
+            return
+        job_info = provider.get_job_info(item, api_url)
         if report.when == "setup" or job_info.get("passed") is not False:
             # Only update the result if it's not already marked as failed
-            data = json.dumps({"passed": passed})
-            requests.put(api_url, data=data, auth=provider.auth, timeout=10)
+            _update_status(item.config, provider, api_url, passed)
+            job_info["passed"] = passed
     except Exception as e:
         summary.append(
             "WARNING: Failed to update {0} job status: {1}".format(provider.name, e)
         )
 
 
+def _update_status(config, provider, api_url, passed):
+    data = json.dumps({"passed": passed})
+    provider.http_session(config).put(
+        api_url, data=data, auth=provider.auth, timeout=10
+    )
+
+
 def driver_kwargs(request, test, capabilities, **kwargs):
+    from selenium.webdriver.common.options import ArgOptions
+
     provider = SauceLabs(request.config.getini("saucelabs_data_center"))
 
     _capabilities = capabilities
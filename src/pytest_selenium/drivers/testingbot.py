@@ -2,10 +2,10 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+from functools import partial
 from hashlib import md5
 
 import pytest
-from selenium.webdriver.common.options import ArgOptions
 
 from pytest_selenium.drivers.cloud import Provider
 
@@ -72,24 +72,41 @@ def pytest_selenium_runtest_makereport(item, report, summary, extra):
     # Add the job URL to the HTML report
     extra.append(pytest_html.extras.url(job_url, "{0} Job".format(provider.name)))
 
-    # lazy import requests for projects that don't need requests
-    import requests
-
     try:
         # Update the job result
         api_url = provider.API.format(session=session_id)
-        job_info = requests.get(api_url, auth=provider.auth, timeout=10).json()
+        sync = getattr(item.config, "_selenium_status_sync", None)
+        if sync is not None:
+            sync.update(
+                api_url,
+                provider.name,
+                not passed,
+                partial(_update_status, item.config, provider, api_url, passed),
+                lambda: provider.get_job_info(item, api_url).get("success") is False,
+                overwrite=report.when == "setup",
+            )
+            return
+        job_info = provider.get_job_info(item, api_url)
         if report.when == "setup" or job_info.get("success") is not False:
             # Only update the result if it's not already marked as failed
-            data = {"test[success]": "1" if passed else "0"}
-            requests.put(api_url, data=data, auth=provider.auth, timeout=10)
+            _update_status(item.config, provider, api_url, passed)
+            job_info["success"] = passed
     except Exception as e:
         summary.append(
             "WARNING: Failed to update {0} job status: {1}".format(provider.name, e)
         )
 
 
+def _update_status(config, provider, api_url, passed):
+    data = {"test[success]": "1" if passed else "0"}
+    provider.http_session(config).put(
+        api_url, data=data, auth=provider.auth, timeout=10
+    )
+
+
 def driver_kwargs(request, test, capabilities, host, port, **kwargs):
+    from selenium.webdriver.common.options import ArgOptions
+
     provider = TestingBot(host, port)
 
     options = ArgOptions()
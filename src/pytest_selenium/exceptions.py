@@ -24,3 +24,18 @@ class InvalidCloudSettingError(pytest.UsageError):
             "{0} {1} invalid value `{2}`, see the documentation for how "
             "to use this parameter.".format(driver, key, value)
         )
+
+
+class ArtifactQuotaExceededError(Exception):
+    def __init__(self, quota):
+        super(ArtifactQuotaExceededError, self).__init__(
+            "artifact quota of {0} bytes exceeded".format(quota)
+        )
+
+
+class SessionSlotTimeoutError(Exception):
+    def __init__(self, slots, timeout):
+        super(SessionSlotTimeoutError, self).__init__(
+            "timed out after {0} seconds waiting for one of {1} session "
+            "slots".format(timeout, slots)
+        )
@@ -0,0 +1,138 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import logging
+import os
+import threading
+import time
+
+from .exceptions import SessionSlotTimeoutError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    import msvcrt
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _try_lock(fd):
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:  # pragma: no cover
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:  # pragma: no cover
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class SessionGovernor(object):
+    """Limit the number of concurrent sessions across processes.
+
+    Each of the ``slots`` sessions is represented by a lock file in
+    ``directory``, which is shared by every process using the same directory,
+    such as xdist workers. Starting a session waits until a slot is free, for
+    at most ``timeout`` seconds if set, and the slot is held until the driver
+    is quit. Locks are released by the operating system if a process dies.
+    """
+
+    def __init__(self, directory, slots, timeout=0, poll_interval=0.1):
+        self.directory = directory
+        self.slots = slots
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.acquired = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self._lock = threading.Lock()
+        self._held = {}
+        self._drivers = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def acquire(self, on_wait=None, blocking=True):
+        """Wait for a free slot, and return it
+
+        While waiting, on_wait is called between attempts, which can free a
+        slot held by this process, such as by quitting an idle driver. If
+        blocking is false, None is returned when no slot is free.
+        """
+        start = time.perf_counter()
+        waited = False
+        while True:
+            slot = self._try_acquire()
+            if slot is not None:
+                break
+            if not blocking:
+                return None
+            if not waited:
+                LOGGER.info("Waiting for one of {0} session slots".format(self.slots))
+                waited = True
+            elapsed = time.perf_counter() - start
+            if self.timeout and elapsed >= self.timeout:
+                with self._lock:
+                    self.waits += 1
+                    self.wait_time += elapsed
+                raise SessionSlotTimeoutError(self.slots, self.timeout)
+            if on_wait is not None:
+                on_wait()
+            time.sleep(self.poll_interval)
+        with self._lock:
+            self.acquired += 1
+            if waited:
+                self.waits += 1
+                self.wait_time += time.perf_counter() - start
+        return slot
+
+    def release(self, slot):
+        """Release a slot so another session can start"""
+        with self._lock:
+            fd = self._held.pop(slot, None)
+        if fd is not None:
+            try:
+                _unlock(fd)
+            finally:
+                os.close(fd)
+
+    def attach(self, driver, slot):
+        """Hold the slot until the driver is released"""
+        with self._lock:
+            self._drivers[id(driver)] = slot
+
+    def release_driver(self, driver):
+        """Release the slot held by the driver, if any"""
+        with self._lock:
+            slot = self._drivers.pop(id(driver), None)
+        if slot is not None:
+            self.release(slot)
+
+    def close(self):
+        """Release every slot held by this process"""
+        with self._lock:
+            slots = list(self._held)
+            self._drivers.clear()
+        for slot in slots:
+            self.release(slot)
+
+    def _try_acquire(self):
+        for slot in range(self.slots):
+            with self._lock:
+                if slot in self._held:
+                    continue
+                path = os.path.join(self.directory, "slot-{0}.lock".format(slot))
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+                if _try_lock(fd):
+                    self._held[slot] = fd
+                    return slot
+                os.close(fd)
+        return None
@@ -0,0 +1,188 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Recompress and downscale screenshots using Pillow."""
+
+import io
+import logging
+import os
+import threading
+
+LOGGER = logging.getLogger(__name__)
+
+# format name: (Pillow format, file extension, mime type)
+FORMATS = {
+    "png": ("PNG", "png", "image/png"),
+    "jpeg": ("JPEG", "jpg", "image/jpeg"),
+    "webp": ("WEBP", "webp", "image/webp"),
+}
+
+
+def process(png, format="png", quality=85, max_dimension=0, thumbnail=0):
+    """Return the processed screenshot, and a thumbnail if requested
+
+    Screenshots are downscaled to fit within max_dimension, and saved as an
+    optimized PNG, or as JPEG or WebP at the given quality. An optimized PNG
+    that is not smaller than the original is replaced by the original.
+    """
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(png))
+    image.load()
+    resized = False
+    if max_dimension and max(image.size) > max_dimension:
+        image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+        resized = True
+    data = _save(image, format, quality)
+    if format == "png" and not resized and len(data) >= len(png):
+        data = png
+    small = None
+    if thumbnail:
+        image.thumbnail((thumbnail, thumbnail), Image.Resampling.LANCZOS)
+        small = _save(image, format, quality)
+    return data, small
+
+
+def _save(image, format, quality):
+    output = io.BytesIO()
+    pil_format = FORMATS[format][0]
+    if pil_format == "PNG":
+        image.save(output, pil_format, optimize=True)
+    else:
+        if pil_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(output, pil_format, quality=quality)
+    return output.getvalue()
+
+
+class ScreenshotProcessor(object):
+    """Process screenshots, optionally in a pool of ``workers`` processes.
+
+    Processing a screenshot waits for the result, but as the work is done in
+    another process it does not hold up other threads, such as those
+    capturing other debug. Screenshots stored as artifacts with a known name
+    are processed and written entirely in the background, and any errors are
+    collected in ``errors``.
+    """
+
+    def __init__(
+        self, format="png", quality=85, max_dimension=0, thumbnail=0, workers=0
+    ):
+        if format not in FORMATS:
+            raise ValueError("Invalid screenshot format: {0}".format(format))
+        # fail early if Pillow is not installed
+        import PIL  # noqa: F401
+
+        self.format = format
+        self.quality = quality
+        self.max_dimension = max_dimension
+        self.thumbnail = thumbnail
+        self.workers = workers
+        self.extension, self.mime_type = FORMATS[format][1:]
+        self.processed = 0
+        self.original_bytes = 0
+        self.processed_bytes = 0
+        self.errors = []
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def process(self, png):
+        """Return the processed screenshot and thumbnail"""
+        future = self._submit(png)
+        if future is None:
+            result = self._process(png)
+        else:
+            result = future.result()
+        self._count(png, result[0])
+        return result
+
+    def check(self, png):
+        """Raise an error if the screenshot cannot be read
+
+        Only the header of the screenshot is read, to fail early on data that
+        is not an image without processing it.
+        """
+        from PIL import Image
+
+        Image.open(io.BytesIO(png)).close()
+
+    def store(self, store, png, name, thumbnail_name=None):
+        """Write the processed screenshot and thumbnail to the artifact store
+
+        Returns the paths the screenshot and thumbnail will be written to. If
+        processing fails, the original screenshot is written to both paths.
+        """
+        path = os.path.join(store.directory, name)
+        thumbnail_path = None
+        if self.thumbnail and thumbnail_name is not None:
+            thumbnail_path = os.path.join(store.directory, thumbnail_name)
+
+        def write(result):
+            data, small = result
+            self._count(png, data)
+            store.write(name, data)
+            if thumbnail_path is not None:
+                store.write(thumbnail_name, small)
+
+        def fallback():
+            # the report already links to both paths
+            store.write(name, png)
+            if thumbnail_path is not None:
+                store.write(thumbnail_name, png)
+
+        future = self._submit(png)
+        if future is None:
+            self._write(write, fallback, self._process, png)
+        else:
+            future.add_done_callback(lambda f: self._write(write, fallback, f.result))
+        return path, thumbnail_path
+
+    def close(self):
+        """Wait for every screenshot to be processed, and return any errors"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        return self.errors
+
+    def _process(self, png):
+        return process(
+            png, self.format, self.quality, self.max_dimension, self.thumbnail
+        )
+
+    def _submit(self, png):
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # imported on first use, to keep loading the plugin fast
+                from concurrent.futures import ProcessPoolExecutor
+                import multiprocessing
+
+                # threads are running, so do not fork the process
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+        return self._executor.submit(
+            process, png, self.format, self.quality, self.max_dimension, self.thumbnail
+        )
+
+    def _write(self, write, fallback, result, *args):
+        try:
+            write(result(*args))
+        except Exception as e:
+            LOGGER.warning("Failed to process screenshot: {0}".format(e))
+            with self._lock:
+                self.errors.append(str(e))
+            try:
+                fallback()
+            except Exception as e:
+                LOGGER.warning("Failed to store screenshot: {0}".format(e))
+                with self._lock:
+                    self.errors.append(str(e))
+
+    def _count(self, png, data):
+        with self._lock:
+            self.processed += 1
+            self.original_bytes += len(png)
+            self.processed_bytes += len(data)
@@ -0,0 +1,175 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from collections import deque
+from datetime import datetime, timezone
+import io
+import logging
+import threading
+import weakref
+import zlib
+
+LOGGER = logging.getLogger(__name__)
+
+_collectors = weakref.WeakKeyDictionary()
+
+
+def get_collector(driver, formatter):
+    """Return the log collector for the driver, creating it if necessary"""
+    collector = _collectors.get(driver)
+    if collector is None:
+        collector = _collectors[driver] = LogCollector(driver, formatter)
+    return collector
+
+
+def iter_log(log, levels=None, exclude=None):
+    """Yield each entry of a log formatted as a line
+
+    Only entries with one of the given levels, and with a message that does
+    not match the exclude regular expression, are formatted.
+    """
+    if levels is not None:
+        levels = {level.upper() for level in levels}
+    last_seconds = prefix = None
+    for entry in log:
+        level = entry["level"]
+        if levels is not None and level.upper() not in levels:
+            continue
+        message = entry["message"]
+        if exclude is not None and exclude.search(message):
+            continue
+        seconds, microseconds = divmod(int(round(entry["timestamp"] * 1000)), 10**6)
+        if seconds != last_seconds:
+            # entries are mostly in order, so format each second once
+            prefix = datetime.fromtimestamp(seconds, timezone.utc).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            )
+            last_seconds = seconds
+        yield "{0}.{1:06d} {2} - {3}".format(
+            prefix, microseconds, level, message
+        ).rstrip()
+
+
+def tail(path, offset=0, max_bytes=0, max_lines=0):
+    """Return the text of a log from offset, limited to the last lines or bytes
+
+    A note of how many bytes were left out is added to the start of the text.
+    """
+    with io.open(path, "rb") as f:
+        end = f.seek(0, io.SEEK_END)
+        if offset > end:
+            offset = 0  # the log has been truncated
+        start = offset
+        if max_bytes and end - start > max_bytes:
+            start = end - max_bytes
+        f.seek(start)
+        # only read up to the end found, as the driver may still be writing
+        data = f.read(end - start)
+    if start > offset:
+        data = data.partition(b"\n")[2]  # skip the partial first line
+    lines = deque(data.splitlines(True), maxlen=max_lines or None)
+    omitted = end - offset - sum(len(line) for line in lines)
+    text = b"".join(lines).decode("utf-8", errors="replace")
+    if omitted:
+        text = "[{0} bytes omitted]\n{1}".format(omitted, text)
+    return text
+
+
+def compress(path, offset=0, chunk_size=64 * 1024):
+    """Yield the gzip compressed contents of a log from offset"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    with io.open(path, "rb") as f:
+        if offset <= f.seek(0, io.SEEK_END):
+            f.seek(offset)
+        else:
+            f.seek(0)  # the log has been truncated
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+    yield compressor.flush()
+
+
+class LogCollector(object):
+    """Incrementally collect the browser logs of a driver.
+
+    Entries are retrieved from the driver once, formatted once, and buffered
+    with a cursor for each log type, so that reading a log only returns the
+    entries added since it was last read. Retrieving a log from the driver
+    removes its entries from the browser, so every entry retrieved is kept.
+
+    Logs can also be drained on a background thread, so that the buffer in
+    the browser does not overflow during long tests.
+    """
+
+    def __init__(self, driver, formatter):
+        # the collector must not keep the driver alive
+        self._driver = weakref.proxy(driver)
+        self._formatter = formatter
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._cursors = {}
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def poll(self, name=None):
+        """Retrieve new entries for the named log type, or for every type"""
+        with self._lock:
+            names = [name] if name is not None else self._driver.log_types
+            for name in names:
+                self._add(name, self._driver.get_log(name))
+
+    def read(self, name):
+        """Return the entries of the named log type added since it was read"""
+        with self._lock:
+            self.poll(name)
+            entries = self._entries.get(name, [])
+            cursor = self._cursors.get(name, 0)
+            self._cursors[name] = len(entries)
+            return "\n".join(entries[cursor:])
+
+    def skip(self):
+        """Discard every entry, such as those left over from a previous test"""
+        with self._lock:
+            try:
+                self.poll()
+            except Exception as e:
+                LOGGER.debug("Unable to retrieve logs: {0}".format(e))
+            self._entries.clear()
+            self._cursors.clear()
+
+    def start(self, interval):
+        """Drain logs every interval seconds on a background thread"""
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._drain,
+            args=(interval,),
+            name="pytest-selenium-logs",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop draining logs in the background"""
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    def _drain(self, interval):
+        while not self._stopped.wait(interval):
+            try:
+                self.poll()
+            except Exception as e:
+                # note that some drivers may not implement logs
+                LOGGER.debug("Stopped draining logs: {0}".format(e))
+                return
+
+    def _add(self, name, log):
+        if not log:
+            return
+        text = self._formatter(log)
+        # every entry may have been filtered out by the formatter
+        if text:
+            self._entries.setdefault(name, []).append(text)
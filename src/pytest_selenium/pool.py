@@ -0,0 +1,233 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import json
+import logging
+import time
+from urllib.parse import urlsplit
+
+LOGGER = logging.getLogger(__name__)
+
+
+def pool_key(driver_class, driver_kwargs):
+    """Return a key identifying drivers that can be shared between tests"""
+    options = driver_kwargs.get("options")
+    if options is not None:
+        capabilities = options.to_capabilities()
+    else:
+        capabilities = driver_kwargs.get("desired_capabilities")
+    return json.dumps(
+        [
+            repr(driver_class),
+            str(driver_kwargs.get("command_executor")),
+            capabilities,
+        ],
+        sort_keys=True,
+        default=repr,
+    )
+
+
+def clone_driver_kwargs(driver_kwargs):
+    """Return a copy of driver_kwargs that can be used to start another driver"""
+    kwargs = dict(driver_kwargs)
+    service = kwargs.get("service")
+    if service is not None:
+        kwargs["service"] = _clone_service(service)
+    return kwargs
+
+
+def _clone_service(service):
+    from selenium.webdriver.common.utils import free_port
+
+    if getattr(service, "shared", False) is True:
+        # the clone uses the same process, and keeps its own log offset
+        return copy.copy(service)
+    clone = copy.copy(service)
+    clone.port = free_port()
+    log_output = getattr(service, "log_output", None)
+    if isinstance(getattr(log_output, "name", None), str):
+        # give the clone its own handle, so either can be stopped first
+        clone.log_output = open(log_output.name, "a+", encoding="utf-8")
+    return clone
+
+
+def reset_driver(driver):
+    """Return the browser to a clean state so it can be used by another test
+
+    Cookies and storage are cleared for the page open in the first window.
+    Chromium based browsers also clear the cookies of every origin, and the
+    other storage of the page, such as IndexedDB and service workers. Storage
+    of other origins is kept.
+    """
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    if hasattr(driver, "execute_cdp_cmd"):
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            url = urlsplit(driver.current_url)
+            if url.scheme in ("http", "https"):
+                origin = "{0}://{1}".format(url.scheme, url.netloc)
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin",
+                    {"origin": origin, "storageTypes": "all"},
+                )
+        except Exception as e:
+            LOGGER.debug("Unable to clear browser data using CDP: {0}".format(e))
+    driver.delete_all_cookies()
+    driver.execute_script(
+        "try { window.localStorage.clear(); window.sessionStorage.clear(); }"
+        " catch (e) {}"
+    )
+    driver.get("about:blank")
+
+
+class DriverPool(object):
+    """Session-level pool of idle drivers keyed by their configuration.
+
+    Drivers are checked out by a test and checked back in at teardown, when
+    their state is reset. At most ``size`` idle drivers are kept alive, with
+    the least recently used driver quit when the pool is full.
+
+    When ``prewarm`` is set, that many spare drivers are started on background
+    threads for the most recently requested configuration, so that a test can
+    be handed an already connected driver.
+    """
+
+    def __init__(self, size, quit_driver, prewarm=0):
+        self.size = size
+        self.prewarm = prewarm
+        self.prewarmed = 0
+        self.hidden_latency = 0.0
+        self._quit_driver = quit_driver
+        self._idle = OrderedDict()
+        self._spares = {}
+        self._executor = None
+        if prewarm > 0:
+            self._executor = ThreadPoolExecutor(
+                max_workers=prewarm, thread_name_prefix="pytest-selenium-prewarm"
+            )
+
+    def checkout(self, key, factory=None):
+        """Return an idle or pre-warmed driver for the given key, or None
+
+        If pre-warming is enabled, factory is used to start spare drivers for
+        the key in the background, and can return None to skip a spare.
+        """
+        drivers = self._idle.get(key)
+        if drivers:
+            driver = drivers.pop()
+            if not drivers:
+                del self._idle[key]
+            LOGGER.info("Reusing pooled driver {0}".format(driver))
+            return driver
+        if self._executor is None or factory is None:
+            return None
+        spares = self._spares.get(key)
+        future = spares.popleft() if spares else None
+        self._top_up(key, factory)
+        if future is None:
+            return None
+        start = time.perf_counter()
+        try:
+            driver, duration = future.result()
+        except Exception as e:
+            LOGGER.warning("Failed to pre-warm driver: {0}".format(e))
+            return None
+        if driver is None:
+            return None
+        self.prewarmed += 1
+        self.hidden_latency += max(0.0, duration - (time.perf_counter() - start))
+        LOGGER.info("Using pre-warmed driver {0}".format(driver))
+        return driver
+
+    def checkin(self, key, driver):
+        """Reset the driver and return it to the pool"""
+        if self.size <= 0:
+            self._quit_driver(driver)
+            return
+        try:
+            reset_driver(driver)
+        except Exception as e:
+            LOGGER.warning("Failed to reset driver, quitting it: {0}".format(e))
+            try:
+                self._quit_driver(driver)
+            except Exception:
+                pass  # the driver is most likely already gone
+            return
+        self._idle.setdefault(key, []).append(driver)
+        self._idle.move_to_end(key)
+        while len(self) > self.size:
+            self._evict()
+
+    def evict_idle(self):
+        """Quit the least recently used idle driver, or else the spare drivers,
+        and return whether any was"""
+        if self._idle:
+            self._evict()
+            return True
+        if any(self._spares.values()):
+            # a spare may hold the session slot the caller is waiting for
+            for key in list(self._spares):
+                self._retire(key)
+            return True
+        return False
+
+    def close(self):
+        """Quit every idle and spare driver in the pool"""
+        while self._idle:
+            self._evict()
+        for key in list(self._spares):
+            self._retire(key)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def _top_up(self, key, factory):
+        for other in list(self._spares):
+            if other != key:
+                # only keep spares for the configuration currently in use
+                self._retire(other)
+        spares = self._spares.setdefault(key, deque())
+        while len(spares) < self.prewarm:
+            spares.append(self._executor.submit(self._spawn, factory))
+
+    def _retire(self, key):
+        for future in self._spares.pop(key):
+            if not future.cancel():
+                future.add_done_callback(self._quit_spare)
+
+    def _quit_spare(self, future):
+        if future.exception() is None:
+            driver, duration = future.result()
+            if driver is None:
+                return
+            try:
+                self._quit_driver(driver)
+            except Exception as e:
+                LOGGER.warning("Failed to quit spare driver: {0}".format(e))
+
+    @staticmethod
+    def _spawn(factory):
+        start = time.perf_counter()
+        driver = factory()
+        return driver, time.perf_counter() - start
+
+    def _evict(self):
+        key, drivers = next(iter(self._idle.items()))
+        driver = drivers.pop(0)
+        if not drivers:
+            del self._idle[key]
+        LOGGER.info("Evicting pooled driver {0}".format(driver))
+        try:
+            self._quit_driver(driver)
+        except Exception as e:
+            LOGGER.warning("Failed to quit pooled driver: {0}".format(e))
+
+    def __len__(self):
+        return sum(len(drivers) for drivers in self._idle.values())
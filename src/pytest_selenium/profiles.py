@@ -0,0 +1,188 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Prepare browser profiles once, and clone them for each session."""
+
+import copy
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# the ioctl sharing the blocks of a file on btrfs, XFS, and similar filesystems
+FICLONE = 0x40049409 if fcntl is not None and sys.platform == "linux" else None
+
+# files locking a profile to the browser using it
+LOCK_FILES = (
+    "lock",
+    ".parentlock",
+    "parent.lock",
+    "SingletonCookie",
+    "SingletonLock",
+    "SingletonSocket",
+)
+
+
+class ProfileTemplates(object):
+    """Build a profile template once for each browser, base profile, and set of
+    preferences, and clone it for each session.
+
+    Templates are copies of the ``firefox`` and ``chrome`` base profiles, with
+    Firefox preferences written to ``user.js``. A browser without a base
+    profile starts with a new profile as usual, as an empty template would not
+    save it any of the work of its first run. Each template is built in
+    ``directory`` under a name derived from its signature, so templates in a
+    directory shared by several processes are only built by one of them. Files
+    are cloned using copy-on-write when the filesystem supports it, and copied
+    otherwise.
+    """
+
+    def __init__(self, directory=None, firefox=None, chrome=None):
+        self.temporary = not directory
+        self.directory = directory or tempfile.mkdtemp(prefix="pytest-selenium-")
+        self.templates_dir = os.path.join(self.directory, "templates")
+        self.sessions_dir = tempfile.mkdtemp(
+            prefix="sessions-", dir=self._makedirs(self.directory)
+        )
+        self.bases = {"firefox": firefox or None, "chrome": chrome or None}
+        self.built = 0
+        self.cloned = 0
+        self.reflinked = 0
+        self._reflink = FICLONE is not None
+        self._templates = {}
+        self._profiles = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, driver, driver_kwargs):
+        """Return driver_kwargs starting the browser with a cloned profile, and
+        the path of the profile, or None if profiles do not apply"""
+        browser = driver.lower()
+        options = driver_kwargs.get("options")
+        if self.bases.get(browser) is None or options is None:
+            return driver_kwargs, None
+        if getattr(options, "profile", None) is not None:
+            # do not replace a profile chosen by the test suite
+            return driver_kwargs, None
+        options = copy.deepcopy(options)
+        if browser == "firefox":
+            # preferences are written to the template instead of each session
+            preferences = dict(options.preferences)
+            options.preferences.clear()
+            path = self.clone(self.template(browser, preferences))
+            options.add_argument("-profile")
+            options.add_argument(path)
+        else:
+            path = self.clone(self.template(browser))
+            options.add_argument("--user-data-dir={0}".format(path))
+        return dict(driver_kwargs, options=options), path
+
+    def template(self, browser, preferences=None):
+        """Return the path of the template, building it on first use"""
+        base = self.bases[browser]
+        signature = json.dumps(
+            [
+                browser,
+                base,
+                os.path.getmtime(base) if base else None,
+                sorted((preferences or {}).items()),
+            ],
+            default=repr,
+        )
+        with self._lock:
+            if signature in self._templates:
+                return self._templates[signature]
+            name = "{0}-{1}".format(
+                browser, hashlib.sha1(signature.encode("utf-8")).hexdigest()[:12]
+            )
+            path = os.path.join(self.templates_dir, name)
+            if not os.path.isdir(path):
+                self._build(path, base, preferences)
+            self._templates[signature] = path
+            return path
+
+    def clone(self, template):
+        """Return the path of a new copy of the template"""
+        path = tempfile.mkdtemp(prefix="profile-", dir=self.sessions_dir)
+        shutil.copytree(
+            template, path, symlinks=True, copy_function=self._copy, dirs_exist_ok=True
+        )
+        with self._lock:
+            self.cloned += 1
+        return path
+
+    def attach(self, driver, path):
+        """Remove the profile once the driver is released"""
+        with self._lock:
+            self._profiles[id(driver)] = path
+
+    def release_driver(self, driver):
+        with self._lock:
+            path = self._profiles.pop(id(driver), None)
+        if path is not None:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def close(self):
+        """Remove the profiles of every session, and any temporary templates"""
+        shutil.rmtree(self.sessions_dir, ignore_errors=True)
+        if self.temporary:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _build(self, path, base, preferences):
+        # build in a temporary directory, so the template appears complete
+        build = tempfile.mkdtemp(
+            prefix=".build-", dir=self._makedirs(self.templates_dir)
+        )
+        try:
+            if base:
+                shutil.copytree(
+                    base,
+                    build,
+                    symlinks=True,
+                    ignore=shutil.ignore_patterns(*LOCK_FILES),
+                    dirs_exist_ok=True,
+                )
+            if preferences:
+                with open(os.path.join(build, "user.js"), "a", encoding="utf-8") as f:
+                    for name, value in sorted(preferences.items()):
+                        f.write(
+                            "user_pref({0}, {1});\n".format(
+                                json.dumps(name), json.dumps(value)
+                            )
+                        )
+            os.rename(build, path)
+        except OSError:
+            shutil.rmtree(build, ignore_errors=True)
+            if not os.path.isdir(path):
+                raise
+            # the template was built by another process at the same time
+        else:
+            self.built += 1
+
+    def _copy(self, source, destination):
+        if self._reflink:
+            try:
+                with open(source, "rb") as src, open(destination, "wb") as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            except OSError:
+                # the filesystem does not support sharing blocks
+                self._reflink = False
+            else:
+                shutil.copystat(source, destination)
+                with self._lock:
+                    self.reflinked += 1
+                return destination
+        return shutil.copy2(source, destination)
+
+    @staticmethod
+    def _makedirs(path):
+        os.makedirs(path, exist_ok=True)
+        return path
@@ -3,44 +3,72 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import argparse
+import base64
+from concurrent import futures
 import copy
-from datetime import datetime
+from functools import partial
+import importlib.util
 import os
-import io
 import logging
+import re
+import shutil
+import tempfile
+import time
 
 import pytest
-from selenium import webdriver
-from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
-from selenium.webdriver.support.event_firing_webdriver import EventFiringWebDriver
 from tenacity import Retrying, stop_after_attempt, wait_exponential
 
-from .utils import CaseInsensitiveDict
+from .artifacts import ArtifactStore, artifact_name, parse_size
+from .drivers.cloud import clear_settings_cache, close_http_sessions
+from .governor import SessionGovernor
+from .images import FORMATS, ScreenshotProcessor
+from .logs import compress, get_collector, iter_log, tail
+from .pool import DriverPool, clone_driver_kwargs, pool_key
+from .profiles import ProfileTemplates
+from .services import SharedServices
+from . import stats
+from .status import SYNC_MODES, StatusSync
+from .teardown import AsyncQuitter
+from . import timing
+from . import tracing
+from .utils import LazyCaseInsensitiveDict, freeze, marker_signature, thaw
 from . import drivers
 
 LOGGER = logging.getLogger(__name__)
 
-SUPPORTED_DRIVERS = CaseInsensitiveDict(
+# driver classes are imported on first use, to keep loading the plugin fast
+SUPPORTED_DRIVERS = LazyCaseInsensitiveDict(
     {
-        "BrowserStack": webdriver.Remote,
-        "CrossBrowserTesting": webdriver.Remote,
-        "Chrome": webdriver.Chrome,
-        "Edge": webdriver.Edge,
-        "Firefox": webdriver.Firefox,
-        "IE": webdriver.Ie,
-        "Remote": webdriver.Remote,
-        "Safari": webdriver.Safari,
-        "SauceLabs": webdriver.Remote,
-        "TestingBot": webdriver.Remote,
+        "BrowserStack": "selenium.webdriver:Remote",
+        "CrossBrowserTesting": "selenium.webdriver:Remote",
+        "Chrome": "selenium.webdriver:Chrome",
+        "Edge": "selenium.webdriver:Edge",
+        "Firefox": "selenium.webdriver:Firefox",
+        "IE": "selenium.webdriver:Ie",
+        "Remote": "selenium.webdriver:Remote",
+        "Safari": "selenium.webdriver:Safari",
+        "SauceLabs": "selenium.webdriver:Remote",
+        "TestingBot": "selenium.webdriver:Remote",
     }
 )
 
-try:
-    from appium import webdriver as appiumdriver
+# drivers starting a job for each session, named after and marked with its test
+CLOUD_DRIVERS = ("browserstack", "crossbrowsertesting", "saucelabs", "testingbot")
 
-    SUPPORTED_DRIVERS["Appium"] = appiumdriver.Remote
-except ImportError:
-    pass  # Appium is optional.
+# types of debug, in the default order they are captured in
+CAPTURE_PRIORITY = ("driver_log", "url", "screenshot", "html", "logs", "hooks")
+
+if importlib.util.find_spec("appium") is not None:
+    # Appium is optional.
+    SUPPORTED_DRIVERS["Appium"] = "appium.webdriver:Remote"
+
+
+def __getattr__(name):
+    if name == "webdriver":
+        from selenium import webdriver
+
+        return webdriver
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
 
 
 def pytest_addhooks(pluginmanager):
@@ -55,6 +83,8 @@ def pytest_addhooks(pluginmanager):
 @pytest.fixture(scope="session")
 def session_capabilities(pytestconfig):
     """Returns combined capabilities from pytest-variables and command line"""
+    from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+
     driver = pytestconfig.getoption("driver").upper()
     capabilities = getattr(DesiredCapabilities, driver, {}).copy()
     if driver == "REMOTE":
@@ -71,9 +101,19 @@ def capabilities(
     session_capabilities,
 ):
     """Returns combined capabilities"""
-    capabilities = copy.deepcopy(session_capabilities)  # make a copy
-    capabilities.update(get_capabilities_from_markers(request.node))
-    return capabilities
+    # capabilities are resolved once for each combination of markers, and
+    # each test is given its own copy of the resolved capabilities
+    key = (
+        "capabilities",
+        id(session_capabilities),
+        marker_signature(request.node, "capabilities"),
+    )
+    cache = request.config._selenium_cache
+    if key not in cache:
+        capabilities = copy.deepcopy(session_capabilities)
+        capabilities.update(get_capabilities_from_markers(request.node))
+        cache[key] = freeze(capabilities)
+    return thaw(cache[key])
 
 
 def get_capabilities_from_markers(node):
@@ -168,19 +208,69 @@ def driver_path(request):
     return request.config.getoption("driver_path")
 
 
+@pytest.fixture(scope="session")
+def driver_pool(pytestconfig):
+    """Return the pool of reusable and pre-warmed drivers, if enabled"""
+    size = int(pytestconfig.getini("selenium_driver_pool_size"))
+    prewarm = int(pytestconfig.getini("selenium_driver_prewarm"))
+    if size <= 0 and prewarm <= 0:
+        yield None
+        return
+    driver = pytestconfig.getoption("driver")
+    if driver is not None and driver.lower() in CLOUD_DRIVERS:
+        # a job can't be shared by tests, so drivers would only be kept open
+        LOGGER.info("Not pooling or pre-warming {0} drivers".format(driver))
+        yield None
+        return
+    pool = DriverPool(size, partial(_quit_driver, pytestconfig), prewarm=prewarm)
+    yield pool
+    pool.close()
+    if pool.prewarmed:
+        stats.add(pytestconfig, "prewarmed_drivers", pool.prewarmed)
+        stats.add(pytestconfig, "prewarm_hidden_latency", pool.hidden_latency)
+
+
 @pytest.fixture
-def driver(request, driver_class, driver_kwargs):
+def driver(request, driver_class, driver_kwargs, driver_pool):
     """Returns a WebDriver instance based on options and capabilities"""
-
-    retries = int(request.config.getini("max_driver_init_attempts"))
-    for retry in Retrying(
-        stop=stop_after_attempt(retries), wait=wait_exponential(), reraise=True
-    ):
-        with retry:
-            LOGGER.info(
-                f"Driver init, attempt {retry.retry_state.attempt_number}/{retries}"
-            )
-            driver = driver_class(**driver_kwargs)
+    pooled = driver_pool is not None and not request.node.get_closest_marker(
+        "fresh_driver"
+    )
+    driver = None
+    if pooled:
+        key = pool_key(driver_class, driver_kwargs)
+        driver = driver_pool.checkout(
+            key,
+            partial(_start_spare_driver, request.config, driver_class, driver_kwargs),
+        )
+    collector = None
+    if driver is None:
+        driver = _start_driver(
+            request.config,
+            driver_class,
+            driver_kwargs,
+            on_wait=driver_pool.evict_idle if driver_pool is not None else None,
+            properties=request.node.user_properties,
+        )
+        request.node._driver_log_bookmark = _driver_log_bookmark(
+            request.config, driver, reused=False
+        )
+    else:
+        # discard logs left over from the previous test using the driver
+        collector = get_collector(driver, request.config._selenium_log_formatter)
+        collector.skip()
+        request.node._driver_log_bookmark = _driver_log_bookmark(
+            request.config, driver, reused=True
+        )
+    pooled_driver = driver
+    trace_dir = request.config.getini("selenium_trace_dir")
+    tracer = tracing.CommandTracer(driver) if trace_dir else None
+    interval = float(request.config.getini("selenium_log_drain_interval"))
+    if interval > 0:
+        collector = collector or get_collector(
+            driver, request.config._selenium_log_formatter
+        )
+        collector.start(interval)
 
     event_listener = request.config.getoption("event_listener")
     if event_listener is not None:
@@ -188,12 +278,126 @@ def driver(request, driver_class, driver_kwargs):
         mod_name, class_name = event_listener.rsplit(".", 1)
         mod = __import__(mod_name, fromlist=[class_name])
         event_listener = getattr(mod, class_name)
+        from selenium.webdriver.support.event_firing_webdriver import (
+            EventFiringWebDriver,
+        )
+
         if not isinstance(driver, EventFiringWebDriver):
-            driver = EventFiringWebDriver(driver, event_listener())
+            with timing.timer(
+                request.config, "event_listener", request.node.user_properties
+            ):
+                driver = EventFiringWebDriver(driver, event_listener())
 
     request.node._driver = driver
+    request.node._log_collector = get_collector(
+        pooled_driver, request.config._selenium_log_formatter
+    )
     yield driver
-    driver.quit()
+    if collector is not None:
+        collector.stop()
+    if tracer is not None:
+        tracer.detach()
+        tracer.write(trace_dir, request.node.nodeid)
+        tracing.record(request.config, request.node.nodeid, tracer.events)
+    if pooled:
+        driver_pool.checkin(key, pooled_driver)
+    else:
+        _quit_driver(
+            request.config, driver, pooled_driver, request.node.user_properties
+        )
+
+
+def _start_driver(
+    config, driver_class, driver_kwargs, on_wait=None, properties=None, blocking=True
+):
+    governor = getattr(config, "_selenium_governor", None)
+    slot = None
+    if governor is not None:
+        # queue for a session slot rather than retrying against a full grid
+        slot = governor.acquire(on_wait, blocking=blocking)
+        if slot is None:
+            return None
+    profiles = getattr(config, "_selenium_profiles", None)
+    profile = None
+    retries = int(config.getini("max_driver_init_attempts"))
+    try:
+        if profiles is not None:
+            with timing.timer(config, "profile_clone", properties):
+                driver_kwargs, profile = profiles.prepare(
+                    config.getoption("driver"), driver_kwargs
+                )
+        for retry in Retrying(
+            stop=stop_after_attempt(retries), wait=wait_exponential(), reraise=True
+        ):
+            with retry:
+                LOGGER.info(
+                    f"Driver init, attempt {retry.retry_state.attempt_number}/{retries}"
+                )
+                with timing.timer(config, "driver_init", properties):
+                    driver = driver_class(**driver_kwargs)
+    except BaseException:
+        if slot is not None:
+            governor.release(slot)
+        if profile is not None:
+            shutil.rmtree(profile, ignore_errors=True)
+        raise
+    if slot is not None:
+        governor.attach(driver, slot)
+    if profile is not None:
+        profiles.attach(driver, profile)
+    return driver
+
+
+def _start_spare_driver(config, driver_class, driver_kwargs):
+    # never wait for a slot, as a test may be waiting for the same one
+    driver = _start_driver(
+        config, driver_class, clone_driver_kwargs(driver_kwargs), blocking=False
+    )
+    if driver is None:
+        LOGGER.info("Not pre-warming a driver, as no session slot is free")
+    return driver
+
+
+def _driver_log_bookmark(config, driver, reused):
+    """Return the path of the driver log, and the offset the test starts at"""
+    service = getattr(driver, "service", None)
+    log_output = getattr(service, "log_output", None)
+    path = getattr(log_output, "name", None)
+    if not isinstance(path, str):
+        path = getattr(config, "_driver_log", None)
+    if reused and path is not None and os.path.exists(path):
+        # a reused driver logs to the file it was started with
+        return path, os.path.getsize(path)
+    offset = getattr(service, "log_offset", None)
+    if isinstance(offset, int):
+        # a shared service logs every session to the same file
+        return path, offset
+    return path, 0
+
+
+def _quit_driver(config, driver, session=None, properties=None):
+    """Quit the driver, and release the slot and profile of the session it
+    wraps"""
+    governor = getattr(config, "_selenium_governor", None)
+    profiles = getattr(config, "_selenium_profiles", None)
+
+    def done(duration, properties=None):
+        timing.record(config, "driver_quit", duration, properties)
+        if governor is not None:
+            governor.release_driver(session or driver)
+        if profiles is not None:
+            profiles.release_driver(session or driver)
+
+    quitter = getattr(config, "_selenium_quitter", None)
+    if quitter is not None:
+        # the test has been reported by the time a background quit completes
+        quitter.quit(driver, callback=done)
+        return
+    start = time.perf_counter()
+    try:
+        driver.quit()
+    finally:
+        done(time.perf_counter() - start, properties)
 
 
 @pytest.fixture
@@ -218,6 +422,12 @@ def pytest_configure(config):
         "bar"
         ")",
     )
+    config.addinivalue_line(
+        "markers",
+        "fresh_driver: always start a new driver for this test and quit it "
+        "at teardown, even when driver pooling is enabled. Use this for tests "
+        "that change browser-level state.",
+    )
     metadata = config.pluginmanager.getplugin("metadata")
     if metadata:
         try:
@@ -233,6 +443,109 @@ def pytest_configure(config):
                 config.option.selenium_host, config.option.selenium_port
             )
     config._capabilities = capabilities
+    config._selenium_cache = {}
+    config._selenium_log_formatter = _log_formatter(config)
+    config._selenium_timings = config.getini("selenium_timings") or bool(
+        config.getini("selenium_timings_json")
+    )
+    clear_settings_cache()
+    artifact_dir = config.getini("selenium_artifact_dir")
+    if artifact_dir:
+        htmlpath = config.getoption("htmlpath", None)
+        config._selenium_artifacts = ArtifactStore(
+            artifact_dir,
+            quota=parse_size(config.getini("selenium_artifact_quota")),
+            eviction=config.getini("selenium_artifact_eviction").lower(),
+            link_base=os.path.dirname(os.path.abspath(htmlpath)) if htmlpath else None,
+            url=config.getini("selenium_artifact_url") or None,
+            dedup=config.getini("selenium_artifact_dedup"),
+        )
+    unknown = set(
+        name.strip()
+        for name in config.getini("selenium_capture_priority").lower().split(",")
+        if name.strip()
+    ).difference(CAPTURE_PRIORITY)
+    if unknown:
+        raise pytest.UsageError(
+            "selenium_capture_priority must only include {0}".format(CAPTURE_PRIORITY)
+        )
+    screenshot_format = config.getini("selenium_screenshot_format").lower()
+    max_dimension = int(config.getini("selenium_screenshot_max_dimension"))
+    thumbnail = int(config.getini("selenium_screenshot_thumbnail"))
+    if (
+        config.getini("selenium_screenshot_optimize")
+        or screenshot_format != "png"
+        or max_dimension
+        or thumbnail
+    ):
+        if screenshot_format not in FORMATS:
+            raise pytest.UsageError(
+                "selenium_screenshot_format must be one of {0}".format(tuple(FORMATS))
+            )
+        try:
+            config._selenium_screenshot_processor = ScreenshotProcessor(
+                screenshot_format,
+                quality=int(config.getini("selenium_screenshot_quality")),
+                max_dimension=max_dimension,
+                thumbnail=thumbnail,
+                workers=int(config.getini("selenium_screenshot_workers")),
+            )
+        except ImportError:
+            raise pytest.UsageError(
+                "Processing screenshots requires Pillow, which is installed "
+                "with pip install pytest-selenium[images]"
+            )
+    quit_workers = int(config.getini("selenium_quit_workers"))
+    if quit_workers > 0:
+        config._selenium_quitter = AsyncQuitter(
+            quit_workers, int(config.getini("selenium_quit_max_pending"))
+        )
+    status_sync = config.getini("selenium_status_sync").lower()
+    if status_sync != "immediate":
+        config._selenium_status_sync = StatusSync(
+            status_sync, int(config.getini("selenium_http_pool_size"))
+        )
+    if config.getini("selenium_shared_services"):
+        config._selenium_services = SharedServices()
+    if config.getini("selenium_profile_templates"):
+        firefox = config.getini("selenium_firefox_profile")
+        chrome = config.getini("selenium_chrome_profile")
+        if firefox or chrome:
+            config._selenium_profiles = ProfileTemplates(
+                config.getini("selenium_profile_dir"), firefox=firefox, chrome=chrome
+            )
+        else:
+            # a template without a base profile has nothing to save the browser
+            config.issue_config_time_warning(
+                pytest.PytestConfigWarning(
+                    "selenium_profile_templates requires selenium_firefox_profile "
+                    "or selenium_chrome_profile to be set, so is ignored"
+                ),
+                stacklevel=2,
+            )
+    max_sessions = int(config.getini("selenium_max_sessions"))
+    if max_sessions > 0:
+        workerinput = getattr(config, "workerinput", {})
+        directory = workerinput.get("selenium_session_lock_dir") or config.getini(
+            "selenium_session_lock_dir"
+        )
+        if not directory:
+            # slots are shared with xdist workers through a temporary directory
+            directory = config._selenium_session_lock_tmp = tempfile.mkdtemp(
+                prefix="pytest-selenium-slots-"
+            )
+        config._selenium_governor = SessionGovernor(
+            directory,
+            max_sessions,
+            timeout=float(config.getini("selenium_session_slot_timeout")),
+        )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    governor = getattr(node.config, "_selenium_governor", None)
+    if governor is not None:
+        node.workerinput["selenium_session_lock_dir"] = governor.directory
 
 
 def pytest_report_header(config, start_path):
@@ -241,6 +554,198 @@ def pytest_report_header(config, start_path):
         return "driver: {0}".format(driver)
 
 
+def pytest_sessionfinish(session):
+    executor = getattr(session.config, "_selenium_capture_executor", None)
+    if executor is not None:
+        # do not wait for captures that have already timed out
+        executor.shutdown(wait=False)
+    processor = getattr(session.config, "_selenium_screenshot_processor", None)
+    if processor is not None:
+        for error in processor.close():
+            stats.append(session.config, "screenshot_errors", error)
+        stats.add(session.config, "screenshots_processed", processor.processed)
+        stats.add(
+            session.config, "screenshots_original_bytes", processor.original_bytes
+        )
+        stats.add(
+            session.config, "screenshots_processed_bytes", processor.processed_bytes
+        )
+    status_sync = getattr(session.config, "_selenium_status_sync", None)
+    if status_sync is not None:
+        for error in status_sync.flush():
+            stats.append(session.config, "status_errors", error)
+        stats.add(session.config, "status_updates", status_sync.sent)
+    close_http_sessions()
+    quitter = getattr(session.config, "_selenium_quitter", None)
+    if quitter is not None:
+        for error in quitter.drain():
+            stats.append(session.config, "quit_errors", error)
+        stats.add(session.config, "async_quits", quitter.quits)
+    governor = getattr(session.config, "_selenium_governor", None)
+    if governor is not None:
+        governor.close()
+        stats.add(session.config, "session_slot_waits", governor.waits)
+        stats.add(session.config, "session_slot_wait_time", governor.wait_time)
+    services = getattr(session.config, "_selenium_services", None)
+    if services is not None:
+        services.close()
+        stats.add(session.config, "shared_service_sessions", services.sessions)
+        stats.add(session.config, "shared_services_started", services.started)
+        stats.add(session.config, "shared_service_restarts", services.restarts)
+    profiles = getattr(session.config, "_selenium_profiles", None)
+    if profiles is not None:
+        profiles.close()
+        stats.add(session.config, "profile_templates_built", profiles.built)
+        stats.add(session.config, "profiles_cloned", profiles.cloned)
+        stats.add(session.config, "profile_files_reflinked", profiles.reflinked)
+    lock_tmp = getattr(session.config, "_selenium_session_lock_tmp", None)
+    if lock_tmp is not None:
+        shutil.rmtree(lock_tmp, ignore_errors=True)
+    store = getattr(session.config, "_selenium_artifacts", None)
+    if store is not None and store.dedup:
+        stats.add(session.config, "artifacts_stored", store.stored)
+        stats.add(session.config, "artifacts_duplicates", store.duplicates)
+        stats.add(session.config, "artifacts_saved", store.saved)
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        # send statistics from xdist workers to the controller
+        workeroutput["selenium_stats"] = stats.get_stats(session.config)
+        return
+    timings_json = session.config.getini("selenium_timings_json")
+    timings = stats.get_stats(session.config).get("timings")
+    if timings_json and timings:
+        timing.export(timings, timings_json)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection_finish(session):
+    config = session.config
+    if not hasattr(config, "workerinput") or not config.getoption("selenium_dist"):
+        yield
+        return
+    from .scheduling import driver_group
+
+    # the controller schedules tests by the group added to the node ids sent
+    # with the collection, which are restored before any test is run
+    nodeids = [item.nodeid for item in session.items]
+    for item in session.items:
+        item._nodeid = "{0}@{1}".format(item.nodeid, driver_group(item))
+    try:
+        yield
+    finally:
+        for item, nodeid in zip(session.items, nodeids):
+            item._nodeid = nodeid
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if config.getoption("selenium_dist"):
+        from .scheduling import DriverScheduling
+
+        chunk_size = int(config.getini("selenium_dist_chunk_size"))
+        return DriverScheduling(config, log, chunk_size=chunk_size)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    workeroutput = getattr(node, "workeroutput", {})
+    stats.merge(stats.get_stats(node.config), workeroutput.get("selenium_stats", {}))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    summary = stats.get_stats(config)
+    if not summary:
+        return
+    terminalreporter.write_sep("-", "pytest-selenium")
+    if "prewarmed_drivers" in summary:
+        terminalreporter.write_line(
+            "{0} pre-warmed drivers used, hiding {1:.2f}s of driver "
+            "init latency".format(
+                summary["prewarmed_drivers"], summary["prewarm_hidden_latency"]
+            )
+        )
+    if "async_quits" in summary:
+        terminalreporter.write_line(
+            "{0} drivers quit in the background".format(summary["async_quits"])
+        )
+    if "artifacts_stored" in summary:
+        stored = summary["artifacts_stored"]
+        duplicates = summary["artifacts_duplicates"]
+        terminalreporter.write_line(
+            "{0} artifacts stored, {1} duplicates ({2:.0%} deduplicated), "
+            "{3} bytes saved".format(
+                stored,
+                duplicates,
+                duplicates / float(stored + duplicates or 1),
+                summary["artifacts_saved"],
+            )
+        )
+    if summary.get("shared_service_sessions"):
+        terminalreporter.write_line(
+            "{0} sessions shared {1} driver service processes, restarting {2} "
+            "of them".format(
+                summary["shared_service_sessions"],
+                summary["shared_services_started"],
+                summary["shared_service_restarts"],
+            )
+        )
+    if summary.get("profiles_cloned"):
+        terminalreporter.write_line(
+            "{0} browser profiles cloned from {1} new templates, sharing {2} "
+            "files copy-on-write".format(
+                summary["profiles_cloned"],
+                summary["profile_templates_built"],
+                summary["profile_files_reflinked"],
+            )
+        )
+    if summary.get("captures_skipped"):
+        terminalreporter.write_line(
+            "{0} types of debug skipped after exhausting the capture "
+            "budget".format(summary["captures_skipped"])
+        )
+    if summary.get("screenshots_processed"):
+        original = summary["screenshots_original_bytes"]
+        processed = summary["screenshots_processed_bytes"]
+        terminalreporter.write_line(
+            "{0} screenshots processed, reducing {1} bytes to {2} "
+            "({3:.0%} saved)".format(
+                summary["screenshots_processed"],
+                original,
+                processed,
+                1 - processed / float(original or 1),
+            )
+        )
+    if "status_updates" in summary:
+        terminalreporter.write_line(
+            "{0} job status updates sent after the test".format(
+                summary["status_updates"]
+            )
+        )
+    if summary.get("session_slot_waits"):
+        waits = summary["session_slot_waits"]
+        terminalreporter.write_line(
+            "{0} sessions queued for a slot, waiting {1:.2f}s in total "
+            "({2:.2f}s on average)".format(
+                waits,
+                summary["session_slot_wait_time"],
+                summary["session_slot_wait_time"] / waits,
+            )
+        )
+    if "timings" in summary and config.getini("selenium_timings"):
+        for line in timing.table(summary["timings"]):
+            terminalreporter.write_line(line)
+    for line in tracing.report(summary):
+        terminalreporter.write_line(line)
+    for error in summary.get("quit_errors", []):
+        terminalreporter.write_line("WARNING: Failed to quit driver: {0}".format(error))
+    for error in summary.get("screenshot_errors", []):
+        terminalreporter.write_line(
+            "WARNING: Failed to process screenshot: {0}".format(error)
+        )
+    for error in summary.get("status_errors", []):
+        terminalreporter.write_line("WARNING: {0}".format(error))
+
+
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
@@ -253,24 +758,13 @@ def pytest_runtest_makereport(item, call):
     when = item.config.getini("selenium_capture_debug").lower()
     capture_debug = when == "always" or (when == "failure" and failure)
     if capture_debug:
-        exclude = item.config.getini("selenium_exclude_debug").lower()
-        if "logs" not in exclude:
-            # gather logs that do not depend on a driver instance
-            _gather_driver_log(item, summary, extra)
-        if driver is not None:
-            # gather debug that depends on a driver instance
-            if "url" not in exclude:
-                _gather_url(item, report, driver, summary, extra)
-            if "screenshot" not in exclude:
-                _gather_screenshot(item, report, driver, summary, extra)
-            if "html" not in exclude:
-                _gather_html(item, report, driver, summary, extra)
-            if "logs" not in exclude:
-                _gather_logs(item, report, driver, summary, extra)
-            # gather debug from hook implementations
-            item.config.hook.pytest_selenium_capture_debug(
-                item=item, report=report, extra=extra
-            )
+        gatherers = [
+            (label, _timed(name, gather))
+            for name, label, gather in _capture_order(item.config)
+            # only the driver log does not depend on a driver instance
+            if driver is not None or name == "driver_log"
+        ]
+        _run_gatherers(item, report, driver, gatherers, summary, extra)
     if driver is not None:
         # allow hook implementations to further modify the report
         item.config.hook.pytest_selenium_runtest_makereport(
@@ -281,6 +775,157 @@ def pytest_runtest_makereport(item, call):
     report.extras = extra
 
 
+def _timed(name, gather):
+    """Wrap a gatherer to record its duration in the report"""
+
+    def timed_gather(item, report, *args):
+        with timing.timer(
+            item.config, "gather_{0}".format(name), report.user_properties
+        ):
+            gather(item, report, *args)
+
+    return timed_gather
+
+
+def _capture_order(config):
+    """Return the name, label, and gatherer of each type of debug to capture,
+    in order of priority"""
+    exclude = config.getini("selenium_exclude_debug").lower()
+    gatherers = {
+        name: (label, gather)
+        for name, label, gather, excluded_by in (
+            ("driver_log", "driver log", _gather_driver_log, "logs"),
+            ("url", "URL", _gather_url, "url"),
+            ("screenshot", "screenshot", _gather_screenshot, "screenshot"),
+            ("html", "HTML", _gather_html, "html"),
+            ("logs", "logs", _gather_logs, "logs"),
+            ("hooks", "debug from plugins", _gather_hooks, None),
+        )
+        if excluded_by is None or excluded_by not in exclude
+    }
+    priority = config.getini("selenium_capture_priority").lower().split(",")
+    priority = [name.strip() for name in priority if name.strip()]
+    # debug left out of the priority is captured last, in the default order
+    names = [name for name in priority if name in gatherers]
+    names.extend(name for name in gatherers if name not in names)
+    return [(name,) + gatherers[name] for name in names]
+
+
+def _run_gatherers(item, report, driver, gatherers, summary, extra):
+    workers = int(item.config.getini("selenium_capture_workers"))
+    timeout = float(item.config.getini("selenium_capture_timeout")) or None
+    deadline = float(item.config.getini("selenium_capture_deadline")) or None
+    budget = float(item.config.getini("selenium_capture_budget")) or None
+    if workers <= 1 and timeout is None and deadline is None and budget is None:
+        for label, gather in gatherers:
+            gather(item, report, driver, summary, extra)
+        return
+
+    executor = _get_capture_executor(item.config, workers)
+    start = time.monotonic()
+    results = []
+    for label, gather in gatherers:
+        # each gatherer has its own summary and extra, which are combined in
+        # order once they complete
+        _summary, _extra, started = [], [], []
+        future = executor.submit(
+            _started, started, gather, item, report, driver, _summary, _extra
+        )
+        results.append((label, future, started, _summary, _extra))
+    stalled = 0
+    for label, future, started, _summary, _extra in results:
+        error = _wait_for_gatherer(
+            future,
+            started,
+            start,
+            timeout,
+            deadline,
+            budget,
+            stalled >= max(workers, 1),
+        )
+        if error is None:
+            summary.extend(_summary)
+            extra.extend(_extra)
+            continue
+        if error == "budget":
+            summary.append(
+                "WARNING: Skipped gathering {0}: capture budget of {1:g}s "
+                "exhausted".format(label, budget)
+            )
+            stats.add(item.config, "captures_skipped", 1)
+            continue
+        if error == "stalled":
+            summary.append(
+                "WARNING: Failed to gather {0}: every capture thread timed "
+                "out".format(label)
+            )
+            continue
+        if not future.cancel():
+            stalled += 1
+        summary.append(
+            "WARNING: Failed to gather {0}: timed out after {1:.1f}s".format(
+                label, time.monotonic() - (started[0] if started else start)
+            )
+        )
+    if stalled:
+        # leave the threads waiting for a hung browser, so that debug of the
+        # following tests is not queued behind them
+        item.config._selenium_capture_executor = None
+        executor.shutdown(wait=False)
+
+
+def _started(started, gather, *args):
+    # record when the gatherer starts, which its timeout is measured from
+    started.append(time.monotonic())
+    gather(*args)
+
+
+def _wait_for_gatherer(future, started, start, timeout, deadline, budget, stalled):
+    """Wait for a gatherer, and return why it did not complete in time, if it
+    did not
+
+    The timeout is measured from when the gatherer started, and the deadline
+    and budget from the start of capturing debug. When every capture thread
+    is stalled, a gatherer that has not started never will.
+    """
+    while True:
+        elapsed = time.monotonic() - start
+        if budget is not None and elapsed >= budget and future.cancel():
+            # gathering did not start before the budget ran out
+            return "budget"
+        if stalled and not started and future.cancel():
+            return "stalled"
+        limits = [t - elapsed for t in (deadline, budget) if t is not None]
+        if timeout is not None:
+            running = time.monotonic() - started[0] if started else 0
+            limits.append(timeout - running)
+        try:
+            future.result(timeout=max(0, min(limits)) if limits else None)
+            return None
+        except futures.TimeoutError:
+            pass
+        elapsed = time.monotonic() - start
+        if budget is not None and elapsed >= budget and future.cancel():
+            # gathering did not start before the budget ran out
+            return "budget"
+        if any(t is not None and elapsed >= t for t in (deadline, budget)):
+            return "timeout"
+        if timeout is not None and started:
+            if time.monotonic() - started[0] >= timeout:
+                return "timeout"
+        # the gatherer started while waiting, or has not started yet
+
+
+def _get_capture_executor(config, workers):
+    executor = getattr(config, "_selenium_capture_executor", None)
+    if executor is None:
+        executor = futures.ThreadPoolExecutor(
+            max_workers=max(workers, 1), thread_name_prefix="pytest-selenium-capture"
+        )
+        config._selenium_capture_executor = executor
+    return executor
+
+
 def _gather_url(item, report, driver, summary, extra):
     try:
         url = driver.current_url
@@ -295,30 +940,111 @@ def _gather_url(item, report, driver, summary, extra):
 
 
 def _gather_screenshot(item, report, driver, summary, extra):
+    store = getattr(item.config, "_selenium_artifacts", None)
+    processor = getattr(item.config, "_selenium_screenshot_processor", None)
     try:
-        screenshot = driver.get_screenshot_as_base64()
+        if store is not None or processor is not None:
+            screenshot = driver.get_screenshot_as_png()
+        else:
+            screenshot = driver.get_screenshot_as_base64()
     except Exception as e:
         summary.append("WARNING: Failed to gather screenshot: {0}".format(e))
         return
     pytest_html = item.config.pluginmanager.getplugin("html")
+    if processor is None:
+        mime_type, extension, thumbnail = "image/png", "png", None
+    elif (
+        store is not None
+        and not store.dedup
+        and _check_screenshot(processor, screenshot, summary)
+    ):
+        # process and write the screenshot in the background
+        path, thumbnail = processor.store(
+            store,
+            screenshot,
+            artifact_name(item, report, "screenshot", processor.extension),
+            artifact_name(item, report, "thumbnail", processor.extension),
+        )
+        summary.append("Screenshot: {0}".format(path))
+        if pytest_html is not None:
+            _add_screenshot(
+                pytest_html,
+                extra,
+                store.link(path),
+                processor.mime_type,
+                processor.extension,
+                thumbnail and store.link(thumbnail),
+            )
+        return
+    elif store is not None and not store.dedup:
+        # the screenshot cannot be processed, so the original is stored
+        mime_type, extension, thumbnail = "image/png", "png", None
+    else:
+        mime_type, extension = processor.mime_type, processor.extension
+        try:
+            screenshot, thumbnail = processor.process(screenshot)
+        except Exception as e:
+            summary.append("WARNING: Failed to process screenshot: {0}".format(e))
+            mime_type, extension, thumbnail = "image/png", "png", None
+    if store is not None:
+        # reference the stored screenshot instead of embedding it
+        name = artifact_name(item, report, "screenshot", extension)
+        screenshot = _store_artifact(store, "screenshot", summary, name, screenshot)
+        if screenshot is None:
+            return
+        if thumbnail is not None:
+            name = artifact_name(item, report, "thumbnail", extension)
+            thumbnail = _store_artifact(store, "thumbnail", summary, name, thumbnail)
+    elif processor is not None:
+        # thumbnails are only used for stored screenshots
+        screenshot = base64.b64encode(screenshot).decode("ascii")
+        thumbnail = None
     if pytest_html is not None:
-        # add screenshot to the html report
-        extra.append(pytest_html.extras.image(screenshot, "Screenshot"))
+        _add_screenshot(pytest_html, extra, screenshot, mime_type, extension, thumbnail)
+
+
+def _check_screenshot(processor, screenshot, summary):
+    try:
+        processor.check(screenshot)
+    except Exception as e:
+        summary.append("WARNING: Failed to process screenshot: {0}".format(e))
+        return False
+    return True
+
+
+def _add_screenshot(pytest_html, extra, screenshot, mime_type, extension, thumbnail):
+    """Add a screenshot to the html report, linking to it from a thumbnail"""
+    if thumbnail:
+        extra.append(
+            pytest_html.extras.image(thumbnail, "Screenshot", mime_type, extension)
+        )
+        extra.append(pytest_html.extras.url(screenshot, "Full Screenshot"))
+    else:
+        extra.append(
+            pytest_html.extras.image(screenshot, "Screenshot", mime_type, extension)
+        )
 
 
 def _gather_html(item, report, driver, summary, extra):
+    store = getattr(item.config, "_selenium_artifacts", None)
     try:
         html = driver.page_source
     except Exception as e:
         summary.append("WARNING: Failed to gather HTML: {0}".format(e))
         return
     pytest_html = item.config.pluginmanager.getplugin("html")
-    if pytest_html is not None:
+    if store is not None:
+        name = artifact_name(item, report, "html", "html")
+        link = _store_artifact(store, "HTML", summary, name, html)
+        if link is not None and pytest_html is not None:
+            extra.append(pytest_html.extras.url(link, "HTML"))
+    elif pytest_html is not None:
         # add page source to the html report
         extra.append(pytest_html.extras.text(html, "HTML"))
 
 
 def _gather_logs(item, report, driver, summary, extra):
+    store = getattr(item.config, "_selenium_artifacts", None)
     pytest_html = item.config.pluginmanager.getplugin("html")
     try:
         types = driver.log_types
@@ -326,44 +1052,95 @@ def _gather_logs(item, report, driver, summary, extra):
         # note that some drivers may not implement log types
         summary.append("WARNING: Failed to gather log types: {0}".format(e))
         return
+    collector = getattr(item, "_log_collector", None)
     for name in types:
         try:
-            log = driver.get_log(name)
+            if collector is not None:
+                log = collector.read(name)
+            else:
+                log = item.config._selenium_log_formatter(driver.get_log(name))
         except Exception as e:
             summary.append("WARNING: Failed to gather {0} log: {1}".format(name, e))
             return
-        if pytest_html is not None:
-            extra.append(
-                pytest_html.extras.text(format_log(log), "%s Log" % name.title())
+        title = "%s Log" % name.title()
+        if store is not None:
+            filename = artifact_name(item, report, "%s-log" % name, "txt")
+            link = _store_artifact(store, title, summary, filename, log)
+            if link is not None and pytest_html is not None:
+                extra.append(pytest_html.extras.url(link, title))
+        elif pytest_html is not None:
+            extra.append(pytest_html.extras.text(log, title))
+
+
+def _gather_hooks(item, report, driver, summary, extra):
+    # gather debug from hook implementations
+    item.config.hook.pytest_selenium_capture_debug(
+        item=item, report=report, extra=extra
+    )
+
+
+def _gather_driver_log(item, report, driver, summary, extra):
+    config = item.config
+    store = getattr(config, "_selenium_artifacts", None)
+    pytest_html = config.pluginmanager.getplugin("html")
+    path, offset = getattr(
+        item, "_driver_log_bookmark", (getattr(config, "_driver_log", None), 0)
+    )
+    if path is None or not os.path.exists(path):
+        return
+    max_bytes = parse_size(config.getini("selenium_driver_log_max_bytes"))
+    max_lines = int(config.getini("selenium_driver_log_max_lines"))
+    if store is not None:
+        if config.getini("selenium_driver_log_archive"):
+            name = artifact_name(item, report, "driver-log", "txt.gz")
+            link = _store_artifact(
+                store, "full driver log", summary, name, compress(path, offset)
             )
+            if link is not None and pytest_html is not None:
+                extra.append(pytest_html.extras.url(link, "Full Driver Log"))
+        name = artifact_name(item, report, "driver-log", "txt")
+        try:
+            log = tail(path, offset, max_bytes, max_lines)
+            link = store.link(store.write(name, log))
+        except Exception as e:
+            summary.append("WARNING: Failed to store Driver Log: {0}".format(e))
+        else:
+            if pytest_html is not None:
+                extra.append(pytest_html.extras.url(link, "Driver Log"))
+            summary.append("Driver log: {0}".format(path))
+    elif pytest_html is not None:
+        log = tail(path, offset, max_bytes, max_lines)
+        extra.append(pytest_html.extras.text(log, "Driver Log"))
+        summary.append("Driver log: {0}".format(path))
+
+
+def _store_artifact(store, label, summary, name, data):
+    try:
+        path = store.write(name, data)
+    except Exception as e:
+        summary.append("WARNING: Failed to store {0}: {1}".format(label, e))
+        return None
+    summary.append("{0}: {1}".format(label[0].upper() + label[1:], path))
+    return store.link(path)
 
 
-def _gather_driver_log(item, summary, extra):
-    pytest_html = item.config.pluginmanager.getplugin("html")
-    if (
-        hasattr(item.config, "_driver_log")
-        and item.config._driver_log is not None
-        and os.path.exists(item.config._driver_log)
-    ):
-        if pytest_html is not None:
-            with io.open(item.config._driver_log, "r", encoding="utf8") as f:
-                extra.append(pytest_html.extras.text(f.read(), "Driver Log"))
-            summary.append("Driver log: {0}".format(item.config._driver_log))
-
-
-def format_log(log):
-    timestamp_format = "%Y-%m-%d %H:%M:%S.%f"
-    entries = [
-        "{0} {1[level]} - {1[message]}".format(
-            datetime.utcfromtimestamp(entry["timestamp"] / 1000.0).strftime(
-                timestamp_format
-            ),
-            entry,
-        ).rstrip()
-        for entry in log
+def format_log(log, levels=None, exclude=None):
+    return "\n".join(iter_log(log, levels, exclude))
+
+
+def _log_formatter(config):
+    """Return a function formatting logs with the configured filters"""
+    levels = [
+        level.strip()
+        for level in config.getini("selenium_log_levels").split(",")
+        if level.strip()
     ]
-    log = "\n".join(entries)
-    return log
+    exclude = config.getini("selenium_log_exclude")
+    return partial(
+        format_log,
+        levels=levels or None,
+        exclude=re.compile(exclude) if exclude else None,
+    )
 
 
 def split_class_and_test_names(nodeid):
@@ -403,6 +1180,223 @@ def pytest_addoption(parser):
         default=os.getenv("SELENIUM_EXCLUDE_DEBUG", ""),
     )
 
+    parser.addini(
+        "selenium_capture_workers",
+        help="number of threads used to gather debug concurrently",
+        default=os.getenv("SELENIUM_CAPTURE_WORKERS", "1"),
+    )
+    parser.addini(
+        "selenium_capture_timeout",
+        help="seconds to wait for each type of debug (0 waits indefinitely)",
+        default=os.getenv("SELENIUM_CAPTURE_TIMEOUT", "0"),
+    )
+    parser.addini(
+        "selenium_capture_deadline",
+        help="seconds to wait for all debug of a test (0 waits indefinitely)",
+        default=os.getenv("SELENIUM_CAPTURE_DEADLINE", "0"),
+    )
+
+    parser.addini(
+        "selenium_capture_budget",
+        help="seconds to spend capturing all debug of a test, including from "
+        "plugins, skipping the rest in order of priority (0 is unlimited)",
+        default=os.getenv("SELENIUM_CAPTURE_BUDGET", "0"),
+    )
+    parser.addini(
+        "selenium_capture_priority",
+        help="comma separated order to capture debug in {0}".format(CAPTURE_PRIORITY),
+        default=os.getenv("SELENIUM_CAPTURE_PRIORITY", ",".join(CAPTURE_PRIORITY)),
+    )
+
+    parser.addini(
+        "selenium_artifact_dir",
+        help="directory to store debug artifacts in, instead of embedding "
+        "them in the report",
+        default=os.getenv("SELENIUM_ARTIFACT_DIR", ""),
+    )
+    parser.addini(
+        "selenium_artifact_url",
+        help="base URL the artifact directory is served from",
+        default=os.getenv("SELENIUM_ARTIFACT_URL", ""),
+    )
+    parser.addini(
+        "selenium_artifact_quota",
+        help="maximum size of stored debug artifacts, such as 500M (0 is " "unlimited)",
+        default=os.getenv("SELENIUM_ARTIFACT_QUOTA", "0"),
+    )
+    parser.addini(
+        "selenium_artifact_dedup",
+        type="bool",
+        help="store identical debug artifacts once, using the hash of their " "content",
+        default=os.getenv("SELENIUM_ARTIFACT_DEDUP", "false").lower() == "true",
+    )
+    parser.addini(
+        "selenium_screenshot_optimize",
+        type="bool",
+        help="losslessly re-optimize screenshots, which requires Pillow",
+        default=os.getenv("SELENIUM_SCREENSHOT_OPTIMIZE", "false").lower() == "true",
+    )
+    parser.addini(
+        "selenium_screenshot_format",
+        help="format to save screenshots in {0}".format(tuple(FORMATS)),
+        default=os.getenv("SELENIUM_SCREENSHOT_FORMAT", "png"),
+    )
+    parser.addini(
+        "selenium_screenshot_quality",
+        help="quality of jpeg and webp screenshots, from 1 to 100",
+        default=os.getenv("SELENIUM_SCREENSHOT_QUALITY", "85"),
+    )
+    parser.addini(
+        "selenium_screenshot_max_dimension",
+        help="maximum width and height of screenshots, which are downscaled "
+        "to fit (0 is unlimited)",
+        default=os.getenv("SELENIUM_SCREENSHOT_MAX_DIMENSION", "0"),
+    )
+    parser.addini(
+        "selenium_screenshot_thumbnail",
+        help="maximum width and height of thumbnails shown in the report for "
+        "stored screenshots (0 shows the screenshot)",
+        default=os.getenv("SELENIUM_SCREENSHOT_THUMBNAIL", "0"),
+    )
+    parser.addini(
+        "selenium_screenshot_workers",
+        help="number of processes to process screenshots in (0 processes them "
+        "in the test process)",
+        default=os.getenv("SELENIUM_SCREENSHOT_WORKERS", "0"),
+    )
+    parser.addini(
+        "selenium_driver_log_max_bytes",
+        help="size of the end of the driver log to include, such as 1M, or 0 "
+        "to include all of it",
+        default=os.getenv("SELENIUM_DRIVER_LOG_MAX_BYTES", "0"),
+    )
+    parser.addini(
+        "selenium_driver_log_max_lines",
+        help="number of lines at the end of the driver log to include, or 0 to "
+        "include all of them",
+        default=os.getenv("SELENIUM_DRIVER_LOG_MAX_LINES", "0"),
+    )
+    parser.addini(
+        "selenium_driver_log_archive",
+        type="bool",
+        help="store the whole driver log of each test compressed in the "
+        "artifact directory",
+        default=os.getenv("SELENIUM_DRIVER_LOG_ARCHIVE", "false").lower() == "true",
+    )
+    parser.addini(
+        "selenium_log_levels",
+        help="comma separated levels of browser log entries to include, such "
+        "as WARNING,SEVERE (default all)",
+        default=os.getenv("SELENIUM_LOG_LEVELS", ""),
+    )
+    parser.addini(
+        "selenium_log_exclude",
+        help="regular expression for browser log messages to leave out",
+        default=os.getenv("SELENIUM_LOG_EXCLUDE", ""),
+    )
+    parser.addini(
+        "selenium_log_drain_interval",
+        help="seconds between retrieving browser logs in the background "
+        "during a test, or 0 to only retrieve them when capturing debug",
+        default=os.getenv("SELENIUM_LOG_DRAIN_INTERVAL", "0"),
+    )
+    _eviction_choices = ("oldest", "none")
+    parser.addini(
+        "selenium_artifact_eviction",
+        help="how to make room for debug artifacts once the quota is reached "
+        "{0}".format(_eviction_choices),
+        default=os.getenv("SELENIUM_ARTIFACT_EVICTION", "oldest"),
+    )
+
+    parser.addini(
+        "selenium_http_pool_size",
+        help="number of connections to keep alive to the API of a cloud provider",
+        default=os.getenv("SELENIUM_HTTP_POOL_SIZE", "10"),
+    )
+    parser.addini(
+        "selenium_http_retries",
+        help="number of times to retry failed requests to the API of a cloud "
+        "provider",
+        default=os.getenv("SELENIUM_HTTP_RETRIES", "0"),
+    )
+    parser.addini(
+        "selenium_status_sync",
+        help="when to send job status updates to a cloud provider "
+        "{0}".format(SYNC_MODES),
+        default=os.getenv("SELENIUM_STATUS_SYNC", "immediate"),
+    )
+    parser.addini(
+        "selenium_max_sessions",
+        help="maximum number of concurrent sessions across all test processes "
+        "(0 is unlimited)",
+        default=os.getenv("SELENIUM_MAX_SESSIONS", 0),
+    )
+    parser.addini(
+        "selenium_session_lock_dir",
+        help="directory of the session slot locks, which can be shared by "
+        "concurrent test runs",
+        default=os.getenv("SELENIUM_SESSION_LOCK_DIR", ""),
+    )
+    parser.addini(
+        "selenium_session_slot_timeout",
+        help="seconds to wait for a session slot (0 is no limit)",
+        default=os.getenv("SELENIUM_SESSION_SLOT_TIMEOUT", 0),
+    )
+    parser.addini(
+        "selenium_shared_services",
+        type="bool",
+        help="share one driver service process between the local sessions of "
+        "each configuration in a test process",
+        default=os.getenv("SELENIUM_SHARED_SERVICES", "false").lower() == "true",
+    )
+    parser.addini(
+        "selenium_profile_templates",
+        type="bool",
+        help="start local Firefox and Chrome sessions with a copy of a profile "
+        "template prepared once for each configuration",
+        default=os.getenv("SELENIUM_PROFILE_TEMPLATES", "false").lower() == "true",
+    )
+    parser.addini(
+        "selenium_profile_dir",
+        help="directory to keep profile templates in, which can be shared by "
+        "test runs (default is a temporary directory)",
+        default=os.getenv("SELENIUM_PROFILE_DIR", ""),
+    )
+    parser.addini(
+        "selenium_firefox_profile",
+        help="Firefox profile directory to build profile templates from",
+        default=os.getenv("SELENIUM_FIREFOX_PROFILE", ""),
+    )
+    parser.addini(
+        "selenium_chrome_profile",
+        help="Chrome user data directory to build profile templates from",
+        default=os.getenv("SELENIUM_CHROME_PROFILE", ""),
+    )
+    parser.addini(
+        "selenium_timings",
+        type="bool",
+        help="record timings of driver and debug capture phases, and show "
+        "them in the terminal summary",
+        default=os.getenv("SELENIUM_TIMINGS", "false").lower() == "true",
+    )
+    parser.addini(
+        "selenium_timings_json",
+        help="path to export timings of driver and debug capture phases to",
+        default=os.getenv("SELENIUM_TIMINGS_JSON", ""),
+    )
+    parser.addini(
+        "selenium_trace_dir",
+        help="directory to write a trace of the WebDriver commands of each "
+        "test to, in Chrome trace event format",
+        default=os.getenv("SELENIUM_TRACE_DIR", ""),
+    )
+    parser.addini(
+        "selenium_dist_chunk_size",
+        help="maximum number of tests sharing a driver configuration "
+        "distributed to a worker at once with --selenium-dist (0 is automatic)",
+        default=os.getenv("SELENIUM_DIST_CHUNK_SIZE", 0),
+    )
+
     _auth_choices = ("none", "token", "hour", "day")
     parser.addini(
         "saucelabs_job_auth",
@@ -424,6 +1418,29 @@ def pytest_addoption(parser):
         help="Maximum number of driver initialization attempts",
         default=3,
     )
+    parser.addini(
+        "selenium_driver_pool_size",
+        help="maximum number of idle drivers to keep for reuse between tests "
+        "(0 disables driver pooling)",
+        default=os.getenv("SELENIUM_DRIVER_POOL_SIZE", "0"),
+    )
+    parser.addini(
+        "selenium_driver_prewarm",
+        help="number of drivers to start in the background ahead of the tests "
+        "that need them (0 disables pre-warming)",
+        default=os.getenv("SELENIUM_DRIVER_PREWARM", "0"),
+    )
+    parser.addini(
+        "selenium_quit_workers",
+        help="number of background threads used to quit drivers "
+        "(0 quits drivers during test teardown)",
+        default=os.getenv("SELENIUM_QUIT_WORKERS", "0"),
+    )
+    parser.addini(
+        "selenium_quit_max_pending",
+        help="maximum number of drivers waiting to be quit in the background",
+        default=os.getenv("SELENIUM_QUIT_MAX_PENDING", "10"),
+    )
     group = parser.getgroup("selenium", "selenium")
     group._addoption(
         "--driver",
@@ -465,3 +1482,9 @@ def pytest_addoption(parser):
         "which will default to the cloud provider default "
         "or localhost.",
     )
+    group._addoption(
+        "--selenium-dist",
+        action="store_true",
+        help="distribute tests sharing a driver configuration to the same "
+        "pytest-xdist worker.",
+    )
@@ -5,15 +5,25 @@
 from functools import partial
 import os
 import re
+import time
 
 import pytest
 
+REDIRECTS_KEY = "pytest-selenium/redirects"
+
 
 def pytest_addoption(parser):
     parser.addini(
         "sensitive_url", help="regular expression for identifying sensitive urls."
     )
 
+    parser.addini(
+        "sensitive_url_cache_ttl",
+        help="seconds to cache the redirects of the base url between runs, or 0 "
+        "to check them every run.",
+        default=os.getenv("SENSITIVE_URL_CACHE_TTL", "0"),
+    )
+
     group = parser.getgroup("safety", "safety")
     group._addoption(
         "--sensitive-url", help="regular expression for identifying sensitive urls."
@@ -36,6 +46,57 @@ def pytest_configure(config):
     )
 
 
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Check the redirects of the base url once, and share them with workers"""
+    base_url = node.config.getoption("base_url", None)
+    sensitive_url = node.config.getoption("sensitive_url")
+    if base_url and not re.search(sensitive_url, base_url):
+        node.workerinput["sensitive_url_redirects"] = {
+            base_url: get_redirect_urls(node.config, base_url)
+        }
+
+
+def get_redirect_urls(config, base_url):
+    """Return the urls the base url redirects through
+
+    The redirects are checked once per session, and are shared with xdist
+    workers. They are also cached between runs if ``sensitive_url_cache_ttl``
+    is set.
+    """
+    if not hasattr(config, "_sensitive_url_redirects"):
+        workerinput = getattr(config, "workerinput", {})
+        config._sensitive_url_redirects = dict(
+            workerinput.get("sensitive_url_redirects", {})
+        )
+    redirects = config._sensitive_url_redirects
+    if base_url not in redirects:
+        ttl = float(config.getini("sensitive_url_cache_ttl"))
+        cache = getattr(config, "cache", None) if ttl > 0 else None
+        entry = cache.get(REDIRECTS_KEY, {}).get(base_url) if cache else None
+        if entry and time.time() - entry["time"] < ttl:
+            redirects[base_url] = entry["urls"]
+        else:
+            urls = _probe(base_url)
+            if cache is not None and urls is not None:
+                entries = cache.get(REDIRECTS_KEY, {})
+                entries[base_url] = {"urls": urls, "time": time.time()}
+                cache.set(REDIRECTS_KEY, entries)
+            redirects[base_url] = urls or []
+    return redirects[base_url]
+
+
+def _probe(base_url):
+    # lazy import requests for projects that don't need requests
+    import requests
+
+    try:
+        response = requests.get(base_url, timeout=10)
+    except requests.exceptions.RequestException:
+        return None  # ignore exceptions if this URL is unreachable
+    return [response.url] + [history.url for history in response.history]
+
+
 def pytest_report_header(config, start_path):
     base_url = config.getoption("base_url")
     sensitive_url = config.getoption("sensitive_url")
@@ -52,18 +113,11 @@ def sensitive_url(request, base_url):
         return False
     # consider this environment sensitive if the base url or any redirection
     # history matches the regular expression
-    urls = [base_url]
-
-    # lazy import requests for projects that don't need requests
-    import requests
-
-    try:
-        response = requests.get(base_url, timeout=10)
-        urls.append(response.url)
-        urls.extend([history.url for history in response.history])
-    except requests.exceptions.RequestException:
-        pass  # ignore exceptions if this URL is unreachable
     search = partial(re.search, request.config.getoption("sensitive_url"))
+    if search(base_url):
+        # there is no need to check the redirects
+        return base_url
+    urls = [base_url] + get_redirect_urls(request.config, base_url)
     matches = list(map(search, urls))
     if any(matches):
         # return the first match
@@ -0,0 +1,84 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from collections import OrderedDict
+import hashlib
+import math
+
+from xdist.scheduler import LoadScopeScheduling
+
+from .utils import marker_signature
+
+GROUP_PREFIX = "selenium-"
+
+# markers that change the configuration of the driver
+DRIVER_MARKERS = ("capabilities", "firefox_arguments", "firefox_preferences")
+
+
+def driver_group(item):
+    """Return the name of the group of tests sharing a driver configuration"""
+    signature = repr(
+        (item.config.getoption("driver"), marker_signature(item, *DRIVER_MARKERS))
+    )
+    return GROUP_PREFIX + hashlib.sha1(signature.encode("utf-8")).hexdigest()[:8]
+
+
+def split_group(nodeid):
+    """Return the driver group of a node id, or None if it has no group"""
+    position = nodeid.rfind("@")
+    if position > nodeid.rfind("]") and nodeid[position + 1 :].startswith(GROUP_PREFIX):
+        return nodeid[position + 1 :]
+    return None
+
+
+def strip_group(nodeid):
+    """Return the node id without its driver group"""
+    group = split_group(nodeid)
+    return nodeid[: -len(group) - 1] if group else nodeid
+
+
+class DriverScheduling(LoadScopeScheduling):
+    """Distribute tests to workers in groups sharing a driver configuration.
+
+    Workers add the driver group of each test to the node ids sent with their
+    collection, in the same way as the ``loadgroup`` distribution mode, but
+    run and report each test under its own node id. Tests of a group are sent
+    to a worker together, so that the worker can keep reusing the same driver.
+    Large groups are split into chunks of at most ``chunk_size`` tests, which
+    defaults to enough chunks to give each worker at least four, so that the
+    load is still balanced when there are few groups.
+    """
+
+    def __init__(self, config, log=None, chunk_size=0):
+        super(DriverScheduling, self).__init__(config, log)
+        self.chunk_size = chunk_size
+        self._scopes = None
+
+    def _split_scope(self, nodeid):
+        if self._scopes is None:
+            self._scopes = self._chunk(self.collection)
+        return self._scopes.get(nodeid, nodeid)
+
+    def remove_node(self, node):
+        crashitem = super(DriverScheduling, self).remove_node(node)
+        # report a crash under the node id of the test
+        return strip_group(crashitem) if crashitem else crashitem
+
+    def _chunk(self, collection):
+        groups = OrderedDict()
+        for nodeid in collection:
+            groups.setdefault(split_group(nodeid), []).append(nodeid)
+        size = self.chunk_size or max(
+            1, int(math.ceil(len(collection) / float(len(self.nodes) * 4)))
+        )
+        scopes = {}
+        for group, nodeids in groups.items():
+            for index, nodeid in enumerate(nodeids):
+                scopes[nodeid] = "{0}:{1}".format(group, index // size)
+        self.log(
+            "Scheduling {0} tests in {1} driver groups".format(
+                len(collection), len(groups)
+            )
+        )
+        return scopes
@@ -0,0 +1,153 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Share driver service processes between sessions."""
+
+from functools import partial
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_service(config, service_class, **kwargs):
+    """Return a service for a session, shared with other sessions if enabled"""
+    services = getattr(config, "_selenium_services", None)
+    if services is None:
+        return service_class(**kwargs)
+    return services.get(service_class, **kwargs)
+
+
+class SharedServices(object):
+    """Run one driver service process for each configuration, shared by every
+    session in this process.
+
+    Each session is given a :class:`SharedService`, which starts the process
+    on first use, and restarts it if it has exited or stopped responding. All
+    sessions of a configuration log to the same file, so the offset of the log
+    when each session starts is kept in ``log_offset``.
+    """
+
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix="pytest-selenium-services-")
+        self.started = 0
+        self.restarts = 0
+        self.sessions = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, service_class, executable_path=None, service_args=None, **kwargs):
+        """Return a service sharing the process of the same configuration"""
+        key = (service_class, executable_path, tuple(service_args or ()))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                log = os.path.join(
+                    self.directory, "service-{0}.log".format(len(self._entries))
+                )
+                kwargs["log_output"] = log
+                factory = partial(
+                    service_class,
+                    executable_path=executable_path,
+                    service_args=service_args,
+                    **kwargs,
+                )
+                entry = self._entries[key] = _Entry(factory, log)
+        return SharedService(self, entry)
+
+    def start(self, entry, path=None):
+        """Start the process of the entry, unless it is running"""
+        with self._lock:
+            service = entry.service
+            process = getattr(service, "process", None)
+            if process is not None:
+                if process.poll() is None and service.is_connectable():
+                    self.sessions += 1
+                    return service
+                status = process.poll()
+                LOGGER.warning(
+                    "Restarting driver service {0}, which {1}".format(
+                        service.path,
+                        (
+                            "stopped responding"
+                            if status is None
+                            else "exited with {0}".format(status)
+                        ),
+                    )
+                )
+                try:
+                    service.stop()
+                except Exception as e:
+                    LOGGER.warning("Failed to stop driver service: {0}".format(e))
+                service = entry.service = entry.factory()
+                self.restarts += 1
+            if path:
+                service.path = path
+            service.start()
+            self.started += 1
+            self.sessions += 1
+            return service
+
+    def close(self):
+        """Stop every process, and remove their logs"""
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            if getattr(entry.service, "process", None) is not None:
+                try:
+                    entry.service.stop()
+                except Exception as e:
+                    LOGGER.warning("Failed to stop driver service: {0}".format(e))
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class _Entry(object):
+    def __init__(self, factory, log):
+        self.factory = factory
+        self.log = log
+        self.service = factory()
+
+
+class SharedService(object):
+    """A service for one session, using a process shared with other sessions.
+
+    Stopping the service when the driver is quit leaves the process running.
+    Other attributes are those of the shared selenium service.
+    """
+
+    shared = True
+
+    def __init__(self, services, entry):
+        self._services = services
+        self._entry = entry
+        self._path = None
+        self.log_offset = None
+
+    @property
+    def path(self):
+        return self._path or self._entry.service.path
+
+    @path.setter
+    def path(self, value):
+        self._path = value
+
+    def start(self):
+        self._services.start(self._entry, self._path)
+        # the log of this session starts after what has been logged so far
+        try:
+            self.log_offset = os.path.getsize(self._entry.log)
+        except OSError:
+            self.log_offset = 0
+
+    def stop(self):
+        pass  # the process is stopped at the end of the test session
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            # avoid recursion before the instance has been initialised
+            raise AttributeError(name)
+        return getattr(self._entry.service, name)
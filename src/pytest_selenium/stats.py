@@ -0,0 +1,34 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Session statistics, merged from xdist workers into the controller."""
+
+
+def get_stats(config):
+    """Return the statistics recorded for this session"""
+    if not hasattr(config, "_selenium_stats"):
+        config._selenium_stats = {}
+    return config._selenium_stats
+
+
+def add(config, name, value=1):
+    """Add value to the named counter"""
+    stats = get_stats(config)
+    stats[name] = stats.get(name, 0) + value
+
+
+def append(config, name, value):
+    """Append value to the named list"""
+    get_stats(config).setdefault(name, []).append(value)
+
+
+def merge(stats, other):
+    """Merge statistics reported by another process into stats"""
+    for name, value in other.items():
+        if name not in stats:
+            stats[name] = value
+        elif isinstance(value, dict):
+            merge(stats[name], value)
+        else:
+            stats[name] += value
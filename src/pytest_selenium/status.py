@@ -0,0 +1,99 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+LOGGER = logging.getLogger(__name__)
+
+SYNC_MODES = ("immediate", "background", "session")
+
+_Update = namedtuple("_Update", ["name", "failed", "send", "is_failed", "known"])
+
+
+class StatusSync(object):
+    """Send job status updates to cloud providers after the test phase.
+
+    Outcomes are recorded locally, and combined for each job so that a failed
+    job is never marked as passed again, unless the outcome may overwrite a
+    failure, such as the setup of a test starting to use the job.
+    In ``background`` mode the latest status of each job is sent on a
+    background thread, and in ``session`` mode every status is sent when the
+    session finishes, using up to ``workers`` threads.
+    """
+
+    def __init__(self, mode, workers=1):
+        if mode not in SYNC_MODES[1:]:
+            raise ValueError("Invalid status sync mode: {0}".format(mode))
+        self.mode = mode
+        self.workers = workers
+        self.sent = 0
+        self.errors = []
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._failed = {}
+        self._executor = None
+        if mode == "background":
+            # a single thread sends the updates of each job in order
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pytest-selenium-status"
+            )
+
+    def update(self, job, name, failed, send, is_failed, overwrite=False):
+        """Record the outcome of a test phase for a job
+
+        The send callable updates the status of the job, and is_failed returns
+        whether the job is already marked as failed by the provider, which is
+        only called when the status of the job is not known locally.
+        """
+        with self._lock:
+            pending = self._pending.get(job)
+            if pending is not None:
+                failed_before = pending.failed
+            else:
+                failed_before = self._failed.get(job, False)
+            if failed_before and not overwrite:
+                # only update the result if it's not already marked as failed
+                return
+            known = overwrite or job in self._failed
+            if pending is not None:
+                known = known or pending.known
+            self._pending[job] = _Update(name, failed, send, is_failed, known)
+            schedule = self._executor is not None and pending is None
+        if schedule:
+            self._executor.submit(self._send, job)
+
+    def flush(self):
+        """Send every pending status, and wait for them to be sent"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        with self._lock:
+            jobs = list(self._pending)
+        if jobs:
+            with ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="pytest-selenium-status"
+            ) as executor:
+                list(executor.map(self._send, jobs))
+        return self.errors
+
+    def _send(self, job):
+        with self._lock:
+            update = self._pending.pop(job, None)
+        if update is None:
+            return
+        try:
+            send = update.known or not update.is_failed()
+            if send:
+                update.send()
+        except Exception as e:
+            error = "Failed to update {0} job status: {1}".format(update.name, e)
+            LOGGER.warning(error)
+            with self._lock:
+                self.errors.append(error)
+            return
+        with self._lock:
+            self._failed[job] = update.failed or not send
+            self.sent += send
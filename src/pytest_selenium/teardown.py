@@ -0,0 +1,61 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncQuitter(object):
+    """Quit drivers on a bounded pool of background threads.
+
+    At most ``max_pending`` quits may be outstanding at once. Once the limit
+    is reached, handing over another driver blocks until a quit completes, so
+    that leaked sessions do not pile up against the capacity of a grid.
+    """
+
+    def __init__(self, workers, max_pending):
+        self.errors = []
+        self.quits = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(max_pending, 1))
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="pytest-selenium-quit"
+        )
+
+    def quit(self, driver, callback=None):
+        """Schedule the driver to be quit in the background
+
+        The callback is called with the time taken once the driver has been
+        quit, or failed to.
+        """
+        self._slots.acquire()
+        try:
+            self._executor.submit(self._quit, driver, callback)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def drain(self):
+        """Wait for every outstanding quit and return any errors"""
+        self._executor.shutdown(wait=True)
+        return self.errors
+
+    def _quit(self, driver, callback):
+        start = time.perf_counter()
+        try:
+            driver.quit()
+            with self._lock:
+                self.quits += 1
+        except Exception as e:
+            LOGGER.warning("Failed to quit driver: {0}".format(e))
+            with self._lock:
+                self.errors.append(str(e))
+        finally:
+            if callback is not None:
+                callback(time.perf_counter() - start)
+            self._slots.release()
@@ -0,0 +1,83 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Timings of driver and debug capture phases, merged from xdist workers."""
+
+from contextlib import contextmanager
+import json
+import math
+import time
+
+from . import stats
+
+PERCENTILES = (50, 90, 99)
+
+
+def record(config, name, duration, properties=None):
+    """Record the duration of a phase, if timings are enabled
+
+    The duration is also added to properties, such as the user properties of
+    a test or report.
+    """
+    if not getattr(config, "_selenium_timings", False):
+        return
+    timings = stats.get_stats(config).setdefault("timings", {})
+    timings.setdefault(name, []).append(duration)
+    if properties is not None:
+        properties.append(("selenium_timing_{0}".format(name), round(duration, 6)))
+
+
+@contextmanager
+def timer(config, name, properties=None):
+    """Record the duration of the enclosed block"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(config, name, time.perf_counter() - start, properties)
+
+
+def percentile(samples, p):
+    """Return the nearest-rank percentile of sorted samples"""
+    return samples[max(int(math.ceil(p / 100.0 * len(samples))) - 1, 0)]
+
+
+def summarize(timings):
+    """Return the count, total, mean, percentiles, and maximum of each phase"""
+    summary = {}
+    for name, samples in sorted(timings.items()):
+        samples = sorted(samples)
+        total = sum(samples)
+        summary[name] = dict(
+            count=len(samples),
+            total=total,
+            mean=total / len(samples),
+            max=samples[-1],
+            **{"p{0}".format(p): percentile(samples, p) for p in PERCENTILES},
+        )
+    return summary
+
+
+def table(timings):
+    """Return the lines of a table summarizing each phase"""
+    columns = ["total", "mean"] + ["p{0}".format(p) for p in PERCENTILES] + ["max"]
+    lines = [
+        "{0:<24} {1:>7}".format("phase", "count")
+        + "".join(" {0:>9}".format(column) for column in columns)
+    ]
+    for name, summary in summarize(timings).items():
+        lines.append(
+            "{0:<24} {1:>7}".format(name, summary["count"])
+            + "".join(" {0:>8.3f}s".format(summary[column]) for column in columns)
+        )
+    return lines
+
+
+def export(timings, path):
+    """Write the summary and samples of each phase as JSON"""
+    phases = summarize(timings)
+    for name, samples in timings.items():
+        phases[name]["samples"] = samples
+    with open(path, "w") as f:
+        json.dump({"phases": phases}, f, indent=2, sort_keys=True)
@@ -0,0 +1,121 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Trace the WebDriver commands sent by each test."""
+
+import json
+import os
+import threading
+import time
+
+from . import stats
+from .artifacts import slugify
+
+SLOWEST = 10
+
+
+def _size(value):
+    if value is None:
+        return 0
+    return len(json.dumps(value, default=str))
+
+
+class CommandTracer(object):
+    """Record every command sent by a driver.
+
+    Every WebDriver command, including those sent by elements, goes through
+    the ``execute`` method of the driver, which is replaced on the instance
+    until the tracer is detached. The name, duration, and size of the
+    parameters and result of each command are recorded.
+    """
+
+    def __init__(self, driver):
+        self.events = []
+        self._driver = driver
+        self._execute = driver.execute
+        # the driver may already have its own execute, such as another tracer
+        self._replaced = "execute" in getattr(driver, "__dict__", {})
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        driver.execute = self.execute
+
+    def execute(self, driver_command, params=None):
+        start = time.perf_counter()
+        result = None
+        try:
+            result = self._execute(driver_command, params)
+            return result
+        finally:
+            duration = time.perf_counter() - start
+            value = result.get("value") if isinstance(result, dict) else None
+            event = {
+                "name": driver_command,
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": duration * 1e6,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": {"params_bytes": _size(params), "result_bytes": _size(value)},
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def detach(self):
+        """Stop tracing the commands of the driver"""
+        if self._replaced:
+            self._driver.execute = self._execute
+        elif "execute" in getattr(self._driver, "__dict__", {}):
+            del self._driver.execute
+
+    def write(self, directory, nodeid):
+        """Write the trace in Chrome trace event format, and return its path"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, "{0}.trace.json".format(slugify(nodeid)))
+        with self._lock:
+            events = list(self.events)
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "traceEvents": events,
+                    "displayTimeUnit": "ms",
+                    "otherData": {"test": nodeid},
+                },
+                f,
+            )
+        return path
+
+
+def record(config, nodeid, events):
+    """Add the commands of a test to the session statistics"""
+    summary = stats.get_stats(config)
+    counts = summary.setdefault("command_counts", {})
+    times = summary.setdefault("command_time", {})
+    for event in events:
+        duration = event["dur"] / 1e6
+        counts[event["name"]] = counts.get(event["name"], 0) + 1
+        times[event["name"]] = times.get(event["name"], 0.0) + duration
+    slowest = summary.get("slowest_commands", [])
+    slowest.extend([event["dur"] / 1e6, event["name"], nodeid] for event in events)
+    slowest.sort(reverse=True)
+    summary["slowest_commands"] = slowest[:SLOWEST]
+
+
+def report(summary):
+    """Return the lines of the slowest commands summary"""
+    lines = []
+    times = summary.get("command_time", {})
+    if times:
+        lines.append("Slowest WebDriver commands in total:")
+        for name in sorted(times, key=times.get, reverse=True)[:SLOWEST]:
+            lines.append(
+                "{0:>10.3f}s {1:>7} {2}".format(
+                    times[name], summary["command_counts"][name], name
+                )
+            )
+    slowest = sorted(summary.get("slowest_commands", []), reverse=True)[:SLOWEST]
+    if slowest:
+        lines.append("Slowest WebDriver commands:")
+        for duration, name, nodeid in slowest:
+            lines.append("{0:>10.3f}s {1} {2}".format(duration, name, nodeid))
+    return lines
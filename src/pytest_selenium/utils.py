@@ -1,4 +1,6 @@
 from collections.abc import Mapping, MutableMapping
+import importlib
+from types import MappingProxyType
 
 
 class CaseInsensitiveDict(MutableMapping):
@@ -69,3 +71,57 @@ class CaseInsensitiveDict(MutableMapping):
 
     def __repr__(self):
         return str(dict(self.items()))
+
+
+class LazyCaseInsensitiveDict(CaseInsensitiveDict):
+    """A ``CaseInsensitiveDict`` that imports its values on use.
+
+    Values given as ``"module:attribute"`` strings are imported when they are
+    looked up. The imported object is not kept, so it is always taken from the
+    module currently in ``sys.modules``.
+    """
+
+    def __getitem__(self, key):
+        value = self._store[key.lower()][1]
+        if isinstance(value, str):
+            module, _, attribute = value.partition(":")
+            value = getattr(importlib.import_module(module), attribute)
+        return value
+
+    def update(self, *args, **kwargs):
+        if len(args) == 1 and isinstance(args[0], LazyCaseInsensitiveDict):
+            # keep the values of another lazy mapping unimported, such as when
+            # it is restored from a copy by mock.patch.dict
+            self._store.update(args[0]._store)
+            args = ()
+        super(LazyCaseInsensitiveDict, self).update(*args, **kwargs)
+
+    def copy(self):
+        return LazyCaseInsensitiveDict(self._store.values())
+
+
+def marker_signature(node, *names):
+    """Return a hashable signature of the named markers applied to a node"""
+    return tuple(
+        (mark.name, repr(mark.args), repr(sorted(mark.kwargs.items())))
+        for name in names
+        for mark in node.iter_markers(name)
+    )
+
+
+def freeze(value):
+    """Return a read-only copy of a structure of dicts and lists"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    """Return a mutable copy of a structure returned by freeze"""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
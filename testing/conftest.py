@@ -4,8 +4,16 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+# in-process runs restore sys.modules, but packages imported beforehand, such as
+# http by the fake WebDriver server, keep their submodules as attributes, so
+# http.cookiejar must be imported beforehand for requests to use one module
+import http.cookiejar  # noqa: F401
+
 import pytest
 
+import pytest_selenium
+from pytest_selenium.utils import CaseInsensitiveDict
+
 pytest_plugins = "pytester"
 
 
@@ -18,6 +26,24 @@ def httpserver_base_url():
     return "--base-url={0}".format(base_url())
 
 
+@pytest.fixture
+def driver_class(mocker):
+    """Replace the remote driver with a mock, which returns the same mock
+    driver for every session"""
+    driver_class = mocker.MagicMock()
+    driver = driver_class.return_value
+    driver.window_handles = ["main"]
+    driver.current_url = "http://localhost/"
+    driver.get_screenshot_as_base64.return_value = "c2NyZWVuc2hvdA=="
+    driver.page_source = "<html></html>"
+    driver.log_types = []
+    mocker.patch.dict(
+        pytest_selenium.SUPPORTED_DRIVERS,
+        CaseInsensitiveDict({"Remote": driver_class}),
+    )
+    return driver_class
+
+
 @pytest.fixture(autouse=True)
 def testdir(request, httpserver_base_url):
     item = request.node
@@ -0,0 +1,204 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""A fake W3C WebDriver server for tests and benchmarks without browsers.
+
+Supports the status of the server, starting and quitting sessions,
+navigating, the current URL, page source, screenshots, and logs. Other
+commands of a session succeed without doing anything. Each command can be given a latency, to simulate a remote
+grid. Use it with ``--driver remote`` and the host and port of the server::
+
+    with FakeWebDriver(latency=0.01) as server:
+        pytest.main(["--driver", "remote", "--selenium-host", server.host,
+                     "--selenium-port", str(server.port)])
+"""
+
+import base64
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import re
+import threading
+import time
+import uuid
+
+# a transparent 1x1 PNG
+PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA"
+    "60e6kgAAAABJRU5ErkJggg=="
+)
+
+ROUTES = [
+    ("GET", r"/status", "status"),
+    ("POST", r"/session", "newSession"),
+    ("DELETE", r"/session/([^/]+)", "deleteSession"),
+    ("POST", r"/session/([^/]+)/url", "navigateTo"),
+    ("GET", r"/session/([^/]+)/url", "getCurrentUrl"),
+    ("GET", r"/session/([^/]+)/source", "getPageSource"),
+    ("GET", r"/session/([^/]+)/screenshot", "takeScreenshot"),
+    ("GET", r"/session/([^/]+)/window/handles", "getWindowHandles"),
+    ("GET", r"/session/([^/]+)/se/log/types", "getLogTypes"),
+    ("POST", r"/session/([^/]+)/se/log", "getLog"),
+]
+ROUTES = [(method, re.compile(path + "$"), name) for method, path, name in ROUTES]
+
+
+class FakeWebDriver(object):
+    """Serve the W3C WebDriver protocol on a local port.
+
+    Every command waits for ``latency`` seconds, or for the latency of the
+    command in ``latencies``, which is keyed by command names such as
+    ``newSession`` and ``takeScreenshot``. Screenshots and page sources are
+    padded to ``screenshot_bytes`` and ``page_bytes``, and each request for a
+    log returns ``log_entries`` new entries. The number of each command
+    received is counted in ``commands``.
+    """
+
+    def __init__(
+        self,
+        latency=0.0,
+        latencies=None,
+        screenshot_bytes=0,
+        page_bytes=0,
+        log_entries=0,
+        host="127.0.0.1",
+        port=0,
+    ):
+        self.latency = latency
+        self.latencies = dict(latencies or {})
+        self.log_entries = log_entries
+        self.commands = Counter()
+        self.sessions = {}
+        screenshot = PNG + os.urandom(max(screenshot_bytes - len(PNG), 0))
+        self.screenshot = base64.b64encode(screenshot).decode("ascii")
+        self.page_source = "<html><body>{0}</body></html>".format(
+            "x" * max(page_bytes - 26, 0)
+        )
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def host(self):
+        return self._server.server_address[0]
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    @property
+    def url(self):
+        return "http://{0}:{1}".format(self.host, self.port)
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-webdriver", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def handle(self, method, path, body):
+        """Return the status and value of a command"""
+        path = path.split("?")[0]
+        if path.startswith("/wd/hub"):
+            path = path[len("/wd/hub") :]
+        path = path.rstrip("/")
+        for route_method, pattern, name in ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                break
+        else:
+            match = re.match(r"/session/([^/]+)/", path)
+            name = "{0} {1}".format(method, re.sub(r"^/session/[^/]+", "", path))
+        with self._lock:
+            self.commands[name] += 1
+        time.sleep(self.latencies.get(name, self.latency))
+        if name == "status":
+            return 200, {"ready": True, "message": "ready"}
+        if name == "newSession":
+            return 200, self._new_session(body)
+        session = match and self.sessions.get(match.group(1))
+        if session is None:
+            return 404, {
+                "error": "invalid session id",
+                "message": path,
+                "stacktrace": "",
+            }
+        if name == "deleteSession":
+            with self._lock:
+                del self.sessions[match.group(1)]
+            return 200, None
+        if name == "navigateTo":
+            session["url"] = body.get("url")
+            return 200, None
+        if name == "getCurrentUrl":
+            return 200, session["url"]
+        if name == "getPageSource":
+            return 200, self.page_source
+        if name == "takeScreenshot":
+            return 200, self.screenshot
+        if name == "getWindowHandles":
+            return 200, ["main"]
+        if name == "getLogTypes":
+            return 200, ["browser", "driver"]
+        if name == "getLog":
+            return 200, self._log(session)
+        return 200, None
+
+    def _new_session(self, body):
+        capabilities = body.get("capabilities", {}).get("alwaysMatch", {})
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self.sessions[session_id] = {"url": "about:blank", "log": 0}
+        return {"sessionId": session_id, "capabilities": capabilities}
+
+    def _log(self, session):
+        entries = []
+        for _ in range(self.log_entries):
+            session["log"] += 1
+            entries.append(
+                {
+                    "level": "INFO",
+                    "message": "fake log entry {0}".format(session["log"]),
+                    "timestamp": int(time.time() * 1000),
+                }
+            )
+        return entries
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # the headers and body are written separately
+    disable_nagle_algorithm = True
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        status, value = self.server.fake.handle(self.command, self.path, body)
+        data = json.dumps({"value": value}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_DELETE = _respond
+
+    def log_message(self, format, *args):
+        pass  # do not write every request to stderr
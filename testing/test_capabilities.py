@@ -6,6 +6,8 @@ import json
 
 import pytest
 
+import pytest_selenium
+
 pytestmark = pytest.mark.nondestructive
 
 
@@ -76,3 +78,28 @@ def test_mark(testdir):
     """
     )
     testdir.quick_qa(file_test, passed=1)
+
+
+def test_mark_resolved_once(testdir, mocker):
+    spy = mocker.spy(pytest_selenium.pytest_selenium, "get_capabilities_from_markers")
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+        pytestmark = pytest.mark.capabilities(foo={'bar': ['baz']})
+
+        @pytest.mark.nondestructive
+        @pytest.mark.parametrize('run', range(2))
+        def test_capabilities(capabilities, run):
+            assert capabilities['foo'] == {'bar': ['baz']}
+            # changes must not leak into other tests
+            capabilities['foo']['bar'].append('qux')
+            capabilities['foo']['run'] = run
+
+        @pytest.mark.nondestructive
+        @pytest.mark.capabilities(baz='qux')
+        def test_other_capabilities(capabilities):
+            assert capabilities['baz'] == 'qux'
+    """
+    )
+    testdir.quick_qa(file_test, passed=3)
+    assert spy.call_count == 2
@@ -0,0 +1,235 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import json
+import os
+import time
+
+import pytest
+
+from pytest_selenium.artifacts import ArtifactStore, parse_size
+
+pytestmark = pytest.mark.nondestructive
+
+
+@pytest.fixture
+def driver(driver_class):
+    driver = driver_class.return_value
+    driver.log_types = ["browser"]
+    driver.get_log.return_value = [
+        {"timestamp": 0, "level": "INFO", "message": "message"}
+    ]
+    return driver
+
+
+def run(testdir, *ini):
+    testdir.makeini("\n".join(["[pytest]"] + list(ini)))
+    testdir.makeconftest(
+        """
+        import json
+
+        def pytest_runtest_logreport(report):
+            if report.when == "call":
+                names = [extra["name"] for extra in report.extras]
+                with open("extras.json", "w") as f:
+                    json.dump(names, f)
+        """
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+        @pytest.mark.nondestructive
+        def test_fail(driver):
+            assert False
+    """
+    )
+    result = testdir.runpytestqa(file_test)
+    with open(str(testdir.tmpdir.join("extras.json"))) as f:
+        extras = json.load(f)
+    return result, extras
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_capture_order(testdir, driver, workers):
+    result, extras = run(testdir, "selenium_capture_workers = {}".format(workers))
+    result.assert_outcomes(failed=1)
+    assert extras == ["Driver Log", "URL", "Screenshot", "HTML", "Browser Log"]
+    result.stdout.fnmatch_lines(["URL: http://localhost/"])
+
+
+def test_capture_timeout(testdir, driver):
+    def screenshot():
+        time.sleep(2)
+        return "c2NyZWVuc2hvdA=="
+
+    driver.get_screenshot_as_base64.side_effect = screenshot
+    result, extras = run(
+        testdir, "selenium_capture_workers = 4", "selenium_capture_timeout = 0.5"
+    )
+    result.assert_outcomes(failed=1)
+    assert extras == ["Driver Log", "URL", "HTML", "Browser Log"]
+    result.stdout.fnmatch_lines(
+        ["WARNING: Failed to gather screenshot: timed out after *s"]
+    )
+
+
+def test_capture_timeout_of_each_gatherer(testdir, driver, mocker):
+    def slow(value):
+        time.sleep(0.4)
+        return value
+
+    driver.get_screenshot_as_base64.side_effect = lambda: slow("c2NyZWVuc2hvdA==")
+    type(driver).page_source = mocker.PropertyMock(
+        side_effect=lambda: slow("<html></html>")
+    )
+    driver.get_log.side_effect = lambda name: slow([])
+    # each gatherer is within the timeout, but together they exceed it
+    result, extras = run(
+        testdir, "selenium_capture_workers = 1", "selenium_capture_timeout = 0.6"
+    )
+    result.assert_outcomes(failed=1)
+    assert extras == ["Driver Log", "URL", "Screenshot", "HTML", "Browser Log"]
+    assert "timed out" not in result.stdout.str()
+
+
+def test_capture_timeout_stalled(testdir, driver):
+    def screenshot():
+        time.sleep(2)
+        return "c2NyZWVuc2hvdA=="
+
+    driver.get_screenshot_as_base64.side_effect = screenshot
+    result, extras = run(
+        testdir, "selenium_capture_workers = 1", "selenium_capture_timeout = 0.5"
+    )
+    result.assert_outcomes(failed=1)
+    assert extras == ["Driver Log", "URL"]
+    result.stdout.fnmatch_lines(
+        [
+            "WARNING: Failed to gather screenshot: timed out after 0.5s",
+            "WARNING: Failed to gather HTML: every capture thread timed out",
+        ]
+    )
+
+
+def test_capture_budget(testdir, driver):
+    def screenshot():
+        time.sleep(2)
+        return "c2NyZWVuc2hvdA=="
+
+    driver.get_screenshot_as_base64.side_effect = screenshot
+    result, extras = run(testdir, "selenium_capture_budget = 0.5")
+    result.assert_outcomes(failed=1)
+    assert extras == ["Driver Log", "URL"]
+    result.stdout.fnmatch_lines(
+        [
+            "WARNING: Failed to gather screenshot: timed out after *s",
+            "WARNING: Skipped gathering HTML: capture budget of 0.5s exhausted",
+            "WARNING: Skipped gathering logs: capture budget of 0.5s exhausted",
+            "WARNING: Skipped gathering debug from plugins: capture budget of "
+            "0.5s exhausted",
+            "3 types of debug skipped after exhausting the capture budget",
+        ]
+    )
+
+
+def test_capture_priority(testdir, driver):
+    result, extras = run(testdir, "selenium_capture_priority = screenshot, logs, url")
+    result.assert_outcomes(failed=1)
+    assert extras == ["Screenshot", "Browser Log", "URL", "Driver Log", "HTML"]
+
+
+def test_capture_priority_invalid(testdir):
+    testdir.makeini("[pytest]\nselenium_capture_priority = screenshot,video")
+    result = testdir.runpytestqa()
+    result.stderr.fnmatch_lines(["*selenium_capture_priority must only include*"])
+
+
+def test_artifact_store(testdir, driver):
+    driver.get_screenshot_as_png.return_value = b"screenshot"
+    result, extras = run(testdir, "selenium_artifact_dir = artifacts")
+    result.assert_outcomes(failed=1)
+    assert extras == ["Driver Log", "URL", "Screenshot", "HTML", "Browser Log"]
+    artifacts = testdir.tmpdir.join("artifacts")
+    name = "test_artifact_store.py_test_fail-call-{}"
+    assert artifacts.join(name.format("screenshot.png")).read_binary() == (
+        b"screenshot"
+    )
+    assert artifacts.join(name.format("html.html")).read() == "<html></html>"
+    assert artifacts.join(name.format("browser-log.txt")).check()
+    assert artifacts.join(name.format("driver-log.txt")).check()
+    driver.get_screenshot_as_base64.assert_not_called()
+
+
+def test_artifact_quota(testdir, driver):
+    driver.get_screenshot_as_png.return_value = b"screenshot"
+    driver.page_source = "x" * 2048
+    result, extras = run(
+        testdir,
+        "selenium_artifact_dir = artifacts",
+        "selenium_artifact_quota = 1K",
+        "selenium_artifact_eviction = none",
+    )
+    result.assert_outcomes(failed=1)
+    assert "HTML" not in extras
+    result.stdout.fnmatch_lines(
+        ["WARNING: Failed to store HTML: artifact quota of 1024 bytes exceeded"]
+    )
+
+
+def test_driver_log_archive(testdir, driver):
+    driver.get_screenshot_as_png.return_value = b"screenshot"
+    result, extras = run(
+        testdir,
+        "selenium_artifact_dir = artifacts",
+        "selenium_driver_log_archive = true",
+    )
+    result.assert_outcomes(failed=1)
+    assert extras[:2] == ["Full Driver Log", "Driver Log"]
+    name = "test_driver_log_archive.py_test_fail-call-driver-log.txt.gz"
+    assert testdir.tmpdir.join("artifacts", name).check()
+
+
+def test_artifact_eviction(tmpdir):
+    store = ArtifactStore(str(tmpdir), quota=10, eviction="oldest")
+    first = store.write("first.txt", "12345")
+    second = store.write("second.txt", "12345")
+    third = store.write("third.txt", b"123")
+    assert not os.path.exists(first)
+    assert os.path.exists(second)
+    assert os.path.exists(third)
+    assert store.size == 8
+
+
+def test_artifact_dedup(tmpdir):
+    store = ArtifactStore(str(tmpdir), dedup=True)
+    first = store.write("first.html", "<html></html>")
+    second = store.write("second.html", ["<html>", "</html>"])
+    third = store.write("third.png", b"<html></html>")
+    assert first == second
+    assert third != first
+    assert first.startswith(str(tmpdir.join("objects")))
+    assert first.endswith(".html")
+    assert (store.stored, store.duplicates, store.saved) == (2, 1, 13)
+    assert store.size == 26
+    assert not tmpdir.listdir(lambda path: path.ext == ".tmp")
+
+
+def test_artifact_dedup_summary(testdir, driver):
+    driver.get_screenshot_as_png.return_value = b"screenshot"
+    result, extras = run(
+        testdir, "selenium_artifact_dir = artifacts", "selenium_artifact_dedup = true"
+    )
+    result.assert_outcomes(failed=1)
+    assert extras == ["Driver Log", "URL", "Screenshot", "HTML", "Browser Log"]
+    assert testdir.tmpdir.join("artifacts", "objects").check(dir=True)
+    result.stdout.fnmatch_lines(
+        ["4 artifacts stored, 0 duplicates (0% deduplicated), 0 bytes saved"]
+    )
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"), [("0", 0), ("512", 512), ("2K", 2048), ("1MB", 1024**2)]
+)
+def test_parse_size(value, expected):
+    assert parse_size(value) == expected
@@ -4,9 +4,13 @@
 
 from functools import partial
 import os
+from types import SimpleNamespace
 
 import pytest
 
+from pytest_selenium.drivers import crossbrowsertesting
+from pytest_selenium.status import StatusSync
+
 pytestmark = [pytest.mark.skip_selenium, pytest.mark.nondestructive]
 
 
@@ -56,3 +60,74 @@ def test_missing_access_key_file(failure, monkeypatch, tmpdir):
     monkeypatch.setattr(os.path, "expanduser", lambda p: str(tmpdir))
     tmpdir.join(".crossbrowsertesting").write("[credentials]\nusername=foo")
     assert "CrossBrowserTesting key must be set" in failure()
+
+
+def test_job_info_requested_once(monkeypatch, mocker):
+    monkeypatch.setenv("CROSSBROWSERTESTING_USERNAME", "foo")
+    monkeypatch.setenv("CROSSBROWSERTESTING_AUTH_KEY", "bar")
+    session = mocker.MagicMock()
+    mocker.patch("pytest_selenium.drivers.cloud.get_http_session", return_value=session)
+    session.get.return_value.json.return_value = {
+        "show_result_public_url": "https://crossbrowsertesting.com/results",
+        "selenium_test_id": "1",
+    }
+    item = SimpleNamespace(config=mocker.MagicMock(), _driver=mocker.MagicMock())
+    item.config.getoption.return_value = "CrossBrowserTesting"
+    item.config._selenium_status_sync = None
+    report = mocker.MagicMock(passed=False, failed=True, spec=["passed", "failed"])
+    report.when = "call"
+    crossbrowsertesting.pytest_selenium_capture_debug(item, report, [])
+    crossbrowsertesting.pytest_selenium_runtest_makereport(item, report, [], [])
+    report.when = "teardown"
+    crossbrowsertesting.pytest_selenium_runtest_makereport(item, report, [], [])
+    assert session.get.call_count == 1
+    # the job is marked as failed once, and not updated again
+    scores = [call.kwargs["data"]["score"] for call in session.put.call_args_list]
+    assert scores == ["fail"]
+
+
+def test_video_of_failure(monkeypatch, mocker):
+    monkeypatch.setenv("CROSSBROWSERTESTING_USERNAME", "foo")
+    monkeypatch.setenv("CROSSBROWSERTESTING_AUTH_KEY", "bar")
+    session = mocker.MagicMock()
+    mocker.patch("pytest_selenium.drivers.cloud.get_http_session", return_value=session)
+    video = {"image": "image.png", "video": "video.mp4"}
+    session.get.return_value.json.side_effect = [
+        {"selenium_test_id": "1", "test_score": "pass", "videos": []},
+        {"selenium_test_id": "1", "test_score": "pass", "videos": [video]},
+    ]
+    item = SimpleNamespace(config=mocker.MagicMock(), _driver=mocker.MagicMock())
+    item.config.getoption.return_value = "CrossBrowserTesting"
+    item.config._selenium_status_sync = None
+    report = mocker.MagicMock(passed=True, failed=False, spec=["passed", "failed"])
+    report.when = "setup"
+    crossbrowsertesting.pytest_selenium_runtest_makereport(item, report, [], [])
+    report = mocker.MagicMock(passed=False, failed=True, spec=["passed", "failed"])
+    report.when = "call"
+    crossbrowsertesting.pytest_selenium_capture_debug(item, report, [])
+    crossbrowsertesting.pytest_selenium_runtest_makereport(item, report, [], [])
+    # the video is retrieved when the test fails, and not from the setup
+    assert session.get.call_count == 2
+    html = item.config.pluginmanager.getplugin.return_value.extras.html
+    assert "video.mp4" in html.call_args.args[0]
+    scores = [call.kwargs["data"]["score"] for call in session.put.call_args_list]
+    assert scores == ["pass", "fail"]
+
+
+def test_deferred_status_sync(monkeypatch, mocker):
+    monkeypatch.setenv("CROSSBROWSERTESTING_USERNAME", "foo")
+    monkeypatch.setenv("CROSSBROWSERTESTING_AUTH_KEY", "bar")
+    session = mocker.MagicMock()
+    mocker.patch("pytest_selenium.drivers.cloud.get_http_session", return_value=session)
+    session.get.return_value.json.return_value = {"selenium_test_id": "1"}
+    item = SimpleNamespace(config=mocker.MagicMock(), _driver=mocker.MagicMock())
+    item.config.getoption.return_value = "CrossBrowserTesting"
+    item.config._selenium_status_sync = sync = StatusSync("session")
+    for when, passed in (("setup", True), ("call", False), ("teardown", True)):
+        report = mocker.MagicMock(passed=passed, failed=not passed, spec=["passed"])
+        report.when = when
+        crossbrowsertesting.pytest_selenium_runtest_makereport(item, report, [], [])
+    session.put.assert_not_called()
+    assert sync.flush() == []
+    scores = [call.kwargs["data"]["score"] for call in session.put.call_args_list]
+    assert scores == ["fail"]
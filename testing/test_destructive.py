@@ -2,8 +2,12 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+from types import SimpleNamespace
+
 import pytest
 
+from pytest_selenium.safety import get_redirect_urls
+
 pytestmark = pytest.mark.nondestructive
 
 
@@ -78,3 +82,29 @@ def test_run_destructive_and_non_destructive_when_not_sensitive(testdir):
     """
     )
     testdir.quick_qa("--sensitive-url", "foo", file_test, passed=2)
+
+
+def test_redirects_not_checked_when_base_url_is_sensitive(testdir, mocker):
+    get = mocker.patch("requests.get")
+    file_test = testdir.makepyfile("def test_pass(): pass")
+    testdir.quick_qa(file_test, passed=0, failed=0, skipped=1)
+    get.assert_not_called()
+
+
+def test_redirects_cached_between_runs(testdir, mocker):
+    get = mocker.patch("requests.get")
+    get.return_value.url = "http://production"
+    get.return_value.history = []
+    testdir.makefile(".ini", pytest="[pytest]\nsensitive_url_cache_ttl=60")
+    file_test = testdir.makepyfile("def test_pass(): pass")
+    for _ in range(2):
+        testdir.quick_qa("--sensitive-url", "production", file_test, skipped=1)
+    assert get.call_count == 1
+
+
+def test_redirects_shared_with_workers(mocker):
+    get = mocker.patch("requests.get")
+    redirects = {"http://webserver": ["http://production"]}
+    config = SimpleNamespace(workerinput={"sensitive_url_redirects": redirects})
+    assert get_redirect_urls(config, "http://webserver") == ["http://production"]
+    get.assert_not_called()
@@ -0,0 +1,151 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+
+import pytest_selenium
+from pytest_selenium.pool import DriverPool, reset_driver
+
+pytestmark = pytest.mark.nondestructive
+
+
+@pytest.fixture
+def testfile(testdir):
+    return testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        def test_one(driver):
+            assert driver
+
+        @pytest.mark.nondestructive
+        def test_two(driver):
+            assert driver
+    """
+    )
+
+
+def test_pool_disabled(testdir, testfile, driver_class):
+    testdir.quick_qa(testfile, passed=2)
+    assert driver_class.call_count == 2
+    assert driver_class.return_value.quit.call_count == 2
+
+
+def test_pool_reuses_driver(testdir, testfile, driver_class):
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_driver_pool_size = 1
+    """
+    )
+    testdir.quick_qa(testfile, passed=2)
+    driver = driver_class.return_value
+    assert driver_class.call_count == 1
+    assert driver.quit.call_count == 1
+    assert driver.delete_all_cookies.call_count == 2
+    driver.get.assert_called_with("about:blank")
+
+
+def test_pool_fresh_driver_marker(testdir, driver_class):
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_driver_pool_size = 1
+    """
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        @pytest.mark.fresh_driver
+        def test_one(driver):
+            assert driver
+
+        @pytest.mark.nondestructive
+        @pytest.mark.fresh_driver
+        def test_two(driver):
+            assert driver
+    """
+    )
+    testdir.quick_qa(file_test, passed=2)
+    assert driver_class.call_count == 2
+
+
+def test_pool_evicts_least_recently_used(mocker):
+    quit_driver = mocker.MagicMock()
+    first, second = mocker.MagicMock(), mocker.MagicMock()
+    first.window_handles = second.window_handles = ["main"]
+    pool = DriverPool(1, quit_driver)
+    pool.checkin("first", first)
+    pool.checkin("second", second)
+    quit_driver.assert_called_once_with(first)
+    assert pool.checkout("first") is None
+    assert pool.checkout("second") is second
+
+
+@pytest.mark.parametrize(
+    ("url", "origins"),
+    [
+        ("https://example.com:8443/page?query", ["https://example.com:8443"]),
+        ("about:blank", []),
+    ],
+)
+def test_reset_driver_clears_origin(mocker, url, origins):
+    driver = mocker.MagicMock(window_handles=["main"], current_url=url)
+    reset_driver(driver)
+    commands = [call.args for call in driver.execute_cdp_cmd.call_args_list]
+    assert commands[0] == ("Network.clearBrowserCookies", {})
+    assert [params["origin"] for name, params in commands[1:]] == origins
+    driver.delete_all_cookies.assert_called_once_with()
+    driver.get.assert_called_once_with("about:blank")
+
+
+def test_pool_quits_driver_that_fails_to_reset(mocker):
+    quit_driver = mocker.MagicMock()
+    driver = mocker.MagicMock()
+    driver.window_handles = ["main"]
+    driver.delete_all_cookies.side_effect = Exception("Browser gone")
+    pool = DriverPool(1, quit_driver)
+    pool.checkin("key", driver)
+    quit_driver.assert_called_once_with(driver)
+    assert len(pool) == 0
+
+
+def test_prewarm_driver(testdir, testfile, driver_class):
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_driver_prewarm = 1
+    """
+    )
+    result = testdir.runpytestqa(testfile)
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        ["1 pre-warmed drivers used, hiding *s of driver init latency"]
+    )
+    # the spare started during the last test may be cancelled before starting
+    assert driver_class.call_count in (2, 3)
+    assert driver_class.return_value.quit.call_count == driver_class.call_count
+
+
+def test_pool_disabled_for_cloud_drivers(
+    testdir, testfile, driver_class, monkeypatch, mocker
+):
+    monkeypatch.setenv("SAUCELABS_USERNAME", "foo")
+    monkeypatch.setenv("SAUCELABS_API_KEY", "bar")
+    mocker.patch("pytest_selenium.drivers.cloud.get_http_session")
+    mocker.patch.dict(pytest_selenium.SUPPORTED_DRIVERS, {"SauceLabs": driver_class})
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_driver_pool_size = 1
+        selenium_driver_prewarm = 1
+    """
+    )
+    testdir.quick_qa("--driver", "SauceLabs", testfile, passed=2)
+    # each test has its own job, and no spare jobs are started
+    assert driver_class.call_count == 2
+    assert driver_class.return_value.quit.call_count == 2
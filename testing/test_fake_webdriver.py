@@ -0,0 +1,63 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import time
+
+import pytest
+
+from .fake_webdriver import FakeWebDriver
+
+pytestmark = pytest.mark.nondestructive
+
+
+@pytest.fixture
+def server():
+    with FakeWebDriver() as server:
+        yield server
+
+
+def test_remote_driver(testdir, server):
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        def test_pass(selenium):
+            selenium.get("http://www.example.com")
+            assert selenium.current_url == "http://www.example.com"
+
+        @pytest.mark.nondestructive
+        def test_fail(selenium):
+            assert False
+    """
+    )
+    result = testdir.runpytestqa(
+        "--selenium-host",
+        server.host,
+        "--selenium-port",
+        str(server.port),
+        file_test,
+    )
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(["*URL: about:blank*"])
+    assert server.commands["newSession"] == 2
+    assert server.commands["deleteSession"] == 2
+    assert server.commands["takeScreenshot"] == 1
+    assert server.commands["getPageSource"] == 1
+    assert server.sessions == {}
+
+
+def test_latency(server):
+    server.latencies["getCurrentUrl"] = 0.1
+    status, session = server.handle("POST", "/wd/hub/session", {})
+    assert status == 200
+    start = time.perf_counter()
+    status, url = server.handle(
+        "GET", "/session/{0}/url".format(session["sessionId"]), {}
+    )
+    assert time.perf_counter() - start >= 0.1
+    assert url == "about:blank"
+    status, value = server.handle("GET", "/session/unknown/url", {})
+    assert status == 404
+    assert value["error"] == "invalid session id"
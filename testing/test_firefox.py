@@ -142,3 +142,23 @@ def test_arguments_marker(testdir):
     """
     )
     testdir.quick_qa(file_test, passed=1)
+
+
+def test_options_from_markers(testdir):
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+        pytestmark = [
+            pytest.mark.firefox_arguments('-foreground'),
+            pytest.mark.firefox_preferences({'browser.anchor_color': '#FF0000'}),
+        ]
+
+        @pytest.mark.nondestructive
+        @pytest.mark.parametrize('run', range(2))
+        def test_options(firefox_options, run):
+            assert firefox_options.arguments == ['-foreground']
+            assert firefox_options.preferences['browser.anchor_color'] == '#FF0000'
+            firefox_options.add_argument('-run{}'.format(run))
+    """
+    )
+    testdir.quick_qa(file_test, passed=2)
@@ -0,0 +1,187 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import threading
+
+import pytest
+
+from pytest_selenium.exceptions import SessionSlotTimeoutError
+from pytest_selenium.governor import SessionGovernor
+
+pytestmark = pytest.mark.nondestructive
+
+
+@pytest.fixture
+def driver_class(driver_class, mocker):
+    # start a new driver for each session
+    driver_class.drivers = []
+
+    def start(**kwargs):
+        driver = mocker.MagicMock(window_handles=["main"])
+        driver_class.drivers.append(driver)
+        return driver
+
+    driver_class.side_effect = start
+    return driver_class
+
+
+def test_slots_are_shared_between_governors(tmpdir):
+    first = SessionGovernor(str(tmpdir), 1)
+    second = SessionGovernor(str(tmpdir), 1, timeout=0.2, poll_interval=0.01)
+    slot = first.acquire()
+    with pytest.raises(SessionSlotTimeoutError):
+        second.acquire()
+    assert second.waits == 1
+    first.release(slot)
+    second.release(second.acquire())
+    assert second.acquired == 1
+
+
+def test_wait_for_slot(tmpdir):
+    governor = SessionGovernor(str(tmpdir), 2, poll_interval=0.01)
+    slots = [governor.acquire(), governor.acquire()]
+    assert sorted(slots) == [0, 1]
+    timer = threading.Timer(0.1, governor.release, [slots[0]])
+    timer.start()
+    assert governor.acquire() == slots[0]
+    timer.join()
+    assert governor.acquired == 3
+    assert governor.waits == 1
+    assert governor.wait_time > 0
+
+
+def test_on_wait_frees_slot(tmpdir, mocker):
+    governor = SessionGovernor(str(tmpdir), 1, timeout=1, poll_interval=0.01)
+    driver = mocker.MagicMock()
+    governor.attach(driver, governor.acquire())
+    on_wait = mocker.MagicMock(side_effect=lambda: governor.release_driver(driver))
+    governor.acquire(on_wait)
+    assert on_wait.call_count == 1
+
+
+def test_max_sessions(testdir, driver_class):
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_max_sessions = 1
+        selenium_session_slot_timeout = 1
+    """
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        def test_one(driver):
+            assert driver
+
+        @pytest.mark.nondestructive
+        def test_two(driver):
+            assert driver
+    """
+    )
+    testdir.quick_qa(file_test, passed=2)
+    assert driver_class.call_count == 2
+
+
+def test_idle_drivers_release_slots(testdir, driver_class):
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_max_sessions = 1
+        selenium_session_slot_timeout = 1
+        selenium_driver_pool_size = 1
+    """
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        @pytest.mark.capabilities(foo="one")
+        def test_one(driver):
+            assert driver
+
+        @pytest.mark.nondestructive
+        @pytest.mark.capabilities(foo="two")
+        def test_two(driver):
+            assert driver
+    """
+    )
+    testdir.quick_qa(file_test, passed=2)
+    first, second = driver_class.drivers
+    # the idle driver of the first test is quit so the second can start
+    assert first.quit.call_count == 1
+
+
+def test_prewarm_does_not_take_last_slot(testdir, driver_class):
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_max_sessions = 1
+        selenium_session_slot_timeout = 5
+        selenium_driver_prewarm = 1
+    """
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        def test_one(driver):
+            assert driver
+
+        @pytest.mark.nondestructive
+        def test_two(driver):
+            assert driver
+    """
+    )
+    testdir.quick_qa(file_test, passed=2)
+    # every driver started was quit, releasing its slot
+    assert all(driver.quit.call_count == 1 for driver in driver_class.drivers)
+
+
+def test_governor_without_blocking(tmpdir):
+    governor = SessionGovernor(str(tmpdir), 1)
+    slot = governor.acquire()
+    assert governor.acquire(blocking=False) is None
+    governor.release(slot)
+    assert governor.acquire(blocking=False) == slot
+    assert governor.waits == 0
+
+
+def test_slot_timeout(testdir, driver_class):
+    directory = testdir.tmpdir.mkdir("slots")
+    governor = SessionGovernor(str(directory), 1)
+    slot = governor.acquire()
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_max_sessions = 1
+        selenium_session_slot_timeout = 0.2
+        selenium_session_lock_dir = {0}
+    """.format(
+            directory
+        )
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        def test_one(driver):
+            assert driver
+    """
+    )
+    result = testdir.runpytestqa(file_test)
+    governor.release(slot)
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*SessionSlotTimeoutError: timed out after 0.2 seconds waiting for one "
+            "of 1 session slots",
+            "1 sessions queued for a slot*",
+        ]
+    )
+    assert driver_class.call_count == 0
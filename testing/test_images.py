@@ -0,0 +1,205 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import base64
+
+# in-process runs restore sys.modules, so the process pool must be imported
+# beforehand to be able to pickle its own functions
+import concurrent.futures.process  # noqa: F401
+import io
+import json
+
+import pytest
+
+import pytest_selenium
+
+Image = pytest.importorskip("PIL.Image")
+
+from pytest_selenium.images import ScreenshotProcessor, process  # noqa: E402
+
+pytestmark = pytest.mark.nondestructive
+
+
+def png(size=(200, 100), mode="RGBA"):
+    output = io.BytesIO()
+    Image.new(mode, size, "red").save(output, "PNG")
+    return output.getvalue()
+
+
+def size(data):
+    return Image.open(io.BytesIO(data)).size
+
+
+@pytest.fixture
+def driver(driver_class):
+    driver = driver_class.return_value
+    driver.get_screenshot_as_png.return_value = png()
+    return driver
+
+
+def run(testdir, *ini):
+    testdir.makeini("\n".join(["[pytest]"] + list(ini)))
+    testdir.makeconftest(
+        """
+        import json
+
+        def pytest_runtest_logreport(report):
+            if report.when == "call":
+                extras = [
+                    {"name": extra["name"], "extension": extra.get("extension")}
+                    for extra in report.extras
+                ]
+                with open("extras.json", "w") as f:
+                    json.dump(extras, f)
+        """
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+        @pytest.mark.nondestructive
+        def test_fail(driver):
+            assert False
+    """
+    )
+    result = testdir.runpytestqa(file_test)
+    with open(str(testdir.tmpdir.join("extras.json"))) as f:
+        extras = json.load(f)
+    return result, [extra for extra in extras if "Screenshot" in extra["name"]]
+
+
+def test_optimize_keeps_smaller_original():
+    original = png((1, 1))
+    data, thumbnail = process(original)
+    assert len(data) <= len(original)
+    assert thumbnail is None
+
+
+def test_downscale_and_thumbnail():
+    data, thumbnail = process(png(), "webp", max_dimension=100, thumbnail=50)
+    assert Image.open(io.BytesIO(data)).format == "WEBP"
+    assert size(data) == (100, 50)
+    assert size(thumbnail) == (50, 25)
+
+
+def test_jpeg_without_alpha():
+    data, thumbnail = process(png(), "jpeg", quality=50)
+    assert Image.open(io.BytesIO(data)).format == "JPEG"
+    assert size(data) == (200, 100)
+
+
+def test_invalid_format():
+    with pytest.raises(ValueError):
+        ScreenshotProcessor("gif")
+
+
+def test_process_in_workers():
+    processor = ScreenshotProcessor("jpeg", max_dimension=20, workers=1)
+    data, thumbnail = processor.process(png())
+    assert processor.close() == []
+    assert size(data) == (20, 10)
+    assert processor.processed == 1
+    assert processor.processed_bytes == len(data)
+
+
+def test_embedded(testdir, driver):
+    result, extras = run(
+        testdir,
+        "selenium_screenshot_format = jpeg",
+        "selenium_screenshot_thumbnail = 10",
+    )
+    result.assert_outcomes(failed=1)
+    # thumbnails are only used for stored screenshots
+    assert extras == [{"name": "Screenshot", "extension": "jpg"}]
+    result.stdout.fnmatch_lines(
+        ["1 screenshots processed, reducing * bytes to * (*% saved)"]
+    )
+    driver.get_screenshot_as_base64.assert_not_called()
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_stored_thumbnail(testdir, driver, workers):
+    result, extras = run(
+        testdir,
+        "selenium_artifact_dir = artifacts",
+        "selenium_screenshot_format = webp",
+        "selenium_screenshot_max_dimension = 100",
+        "selenium_screenshot_thumbnail = 10",
+        "selenium_screenshot_workers = {0}".format(workers),
+    )
+    result.assert_outcomes(failed=1)
+    assert extras == [
+        {"name": "Screenshot", "extension": "webp"},
+        {"name": "Full Screenshot", "extension": None},
+    ]
+    artifacts = testdir.tmpdir.join("artifacts")
+    name = "test_stored_thumbnail.py_test_fail-call-{0}.webp"
+    assert size(artifacts.join(name.format("screenshot")).read_binary()) == (100, 50)
+    assert size(artifacts.join(name.format("thumbnail")).read_binary()) == (10, 5)
+
+
+def test_process_failure(testdir, driver):
+    driver.get_screenshot_as_png.return_value = b"screenshot"
+    result, extras = run(testdir, "selenium_screenshot_optimize = true")
+    result.assert_outcomes(failed=1)
+    assert extras == [{"name": "Screenshot", "extension": "png"}]
+    result.stdout.fnmatch_lines(["WARNING: Failed to process screenshot: *"])
+
+
+def test_stored_process_failure(testdir, driver):
+    driver.get_screenshot_as_png.return_value = b"screenshot"
+    result, extras = run(
+        testdir,
+        "selenium_artifact_dir = artifacts",
+        "selenium_screenshot_optimize = true",
+        "selenium_screenshot_thumbnail = 10",
+        "selenium_screenshot_workers = 1",
+    )
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["WARNING: Failed to process screenshot: *"])
+    # the original screenshot is stored instead
+    assert extras == [{"name": "Screenshot", "extension": "png"}]
+    artifacts = testdir.tmpdir.join("artifacts")
+    name = "test_stored_process_failure.py_test_fail-call-screenshot.png"
+    assert artifacts.join(name).read_binary() == b"screenshot"
+
+
+def test_stored_background_failure(testdir, driver):
+    # the header can be read, but not the image
+    original = driver.get_screenshot_as_png.return_value = png()[:60]
+    result, extras = run(
+        testdir,
+        "selenium_artifact_dir = artifacts",
+        "selenium_screenshot_format = webp",
+        "selenium_screenshot_thumbnail = 10",
+        "selenium_screenshot_workers = 1",
+    )
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["WARNING: Failed to process screenshot: *"])
+    # the report links to both files, which have the original screenshot
+    artifacts = testdir.tmpdir.join("artifacts")
+    name = "test_stored_background_failure.py_test_fail-call-{0}.webp"
+    assert artifacts.join(name.format("screenshot")).read_binary() == original
+    assert artifacts.join(name.format("thumbnail")).read_binary() == original
+
+
+def test_invalid_format_option(testdir):
+    testdir.makeini("[pytest]\nselenium_screenshot_format = gif")
+    result = testdir.runpytestqa()
+    result.stderr.fnmatch_lines(["*selenium_screenshot_format must be one of*"])
+
+
+def test_embedded_screenshot_is_base64(testdir, driver, mocker):
+    spy = mocker.spy(pytest_selenium.pytest_selenium, "_add_screenshot")
+    testdir.makeini("[pytest]\nselenium_screenshot_format = jpeg")
+    testdir.makepyfile(
+        """
+        import pytest
+        @pytest.mark.nondestructive
+        def test_fail(driver):
+            assert False
+    """
+    )
+    testdir.inline_runqa()
+    screenshot = spy.call_args[0][2]
+    assert base64.b64decode(screenshot)[:2] == b"\xff\xd8"
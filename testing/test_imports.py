@@ -0,0 +1,71 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import subprocess
+import sys
+
+import pytest
+
+import pytest_selenium
+
+pytestmark = pytest.mark.nondestructive
+
+LOAD_PLUGINS = """
+import sys
+from importlib.metadata import entry_points
+
+plugins = entry_points()
+if hasattr(plugins, "select"):
+    plugins = plugins.select(group="pytest11")
+else:
+    plugins = plugins.get("pytest11", [])
+for plugin in plugins:
+    if plugin.value.startswith("pytest_selenium"):
+        plugin.load()
+print(" ".join(sorted({name.split(".")[0] for name in sys.modules})))
+"""
+
+# resolve drivers before and after selenium is removed from sys.modules, as it
+# is by pytester when restoring the modules of an in-process run, and after the
+# drivers are patched by tests
+RESOLVE_DRIVERS = """
+import sys
+from unittest import mock
+
+import pytest_selenium
+
+assert "selenium" not in sys.modules
+for reload in range(2):
+    with mock.patch.dict(pytest_selenium.SUPPORTED_DRIVERS, {"Remote": None}):
+        pass
+    firefox = pytest_selenium.SUPPORTED_DRIVERS["firefox"]
+    from selenium import webdriver
+    assert firefox is webdriver.Firefox
+    for name in [n for n in sys.modules if n.split(".")[0] == "selenium"]:
+        del sys.modules[name]
+"""
+
+
+def test_plugins_do_not_import_drivers():
+    output = subprocess.run(
+        [sys.executable, "-c", LOAD_PLUGINS],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout
+    modules = output.split()
+    assert "pytest_selenium" in modules
+    for name in ("selenium", "appium", "requests"):
+        assert name not in modules
+
+
+def test_supported_drivers_resolved_on_use():
+    from selenium import webdriver
+
+    assert pytest_selenium.SUPPORTED_DRIVERS["firefox"] is webdriver.Firefox
+    assert pytest_selenium.webdriver is webdriver
+
+
+def test_supported_drivers_resolved_after_reload():
+    subprocess.run([sys.executable, "-c", RESOLVE_DRIVERS], check=True)
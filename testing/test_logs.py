@@ -0,0 +1,222 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from functools import partial
+import gzip
+import io
+import re
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_selenium import logs
+from pytest_selenium.logs import LogCollector, compress, iter_log, tail
+from pytest_selenium.pytest_selenium import format_log
+
+pytestmark = pytest.mark.nondestructive
+
+
+def entry(timestamp, message, level="INFO"):
+    return {"timestamp": timestamp, "level": level, "message": message}
+
+
+@pytest.fixture
+def driver(mocker):
+    driver = mocker.MagicMock()
+    driver.log_types = ["browser"]
+    driver.get_log.return_value = []
+    return driver
+
+
+def test_read_returns_new_entries(driver):
+    collector = LogCollector(driver, format_log)
+    driver.get_log.return_value = [entry(0, "one")]
+    assert collector.read("browser").endswith("INFO - one")
+    driver.get_log.return_value = [entry(1, "two")]
+    log = collector.read("browser")
+    assert "one" not in log
+    assert log.endswith("INFO - two")
+    driver.get_log.return_value = []
+    assert collector.read("browser") == ""
+
+
+def test_read_keeps_entries_out_of_order(driver):
+    collector = LogCollector(driver, format_log)
+    driver.get_log.return_value = [
+        entry(2, "b"),
+        entry(1, "a"),
+        entry(3, "x"),
+        entry(3, "x"),
+    ]
+    log = collector.read("browser")
+    assert [line.split(" - ")[1] for line in log.split("\n")] == ["b", "a", "x", "x"]
+    driver.get_log.return_value = [entry(0, "earlier")]
+    assert collector.read("browser").endswith("INFO - earlier")
+
+
+def test_read_keeps_repeated_entries(driver):
+    collector = LogCollector(driver, format_log)
+    driver.get_log.return_value = [entry(1, "same")]
+    collector.read("browser")
+    # each retrieval only returns new entries, even if they are identical
+    assert collector.read("browser").endswith("INFO - same")
+
+
+def test_read_skips_filtered_entries(driver):
+    collector = LogCollector(driver, partial(format_log, levels=["SEVERE"]))
+    driver.get_log.side_effect = [[entry(0, "one")], [entry(1, "two", "SEVERE")]]
+    collector.poll("browser")
+    assert collector.read("browser") == "1970-01-01 00:00:00.001000 SEVERE - two"
+
+
+def test_skip_discards_entries(driver):
+    collector = LogCollector(driver, format_log)
+    driver.get_log.return_value = [entry(0, "one")]
+    collector.skip()
+    driver.get_log.return_value = []
+    assert collector.read("browser") == ""
+
+
+def test_drain_in_background(driver):
+    collector = LogCollector(driver, format_log)
+    driver.get_log.side_effect = [[entry(0, "one")], [entry(1, "two")]] + [[]] * 1000
+    collector.start(0.01)
+    time.sleep(0.2)
+    collector.stop()
+    log = collector.read("browser")
+    assert "INFO - one" in log
+    assert log.endswith("INFO - two")
+
+
+def test_pooled_driver_discards_previous_logs(testdir, driver_class):
+    driver = driver_class.return_value
+    driver.log_types = ["browser"]
+    logs = iter([[entry(0, "first")], [entry(1, "reset")], [entry(2, "second")]])
+    driver.get_log.side_effect = lambda name: next(logs, [])
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_driver_pool_size = 1
+    """
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        def test_one(driver):
+            assert False
+
+        @pytest.mark.nondestructive
+        def test_two(driver):
+            assert False
+    """
+    )
+    reprec = testdir.inline_runqa(file_test)
+    reports = [r for r in reprec.getreports("pytest_runtest_logreport") if r.failed]
+    first, second = (
+        [e["content"] for e in r.extras if e["name"] == "Browser Log"][0]
+        for r in reports
+    )
+    assert "first" in first
+    assert "reset" not in second
+    assert "second" in second
+
+
+@pytest.mark.parametrize(
+    ("offset", "max_bytes", "max_lines", "expected"),
+    [
+        (0, 0, 0, "one\ntwo\nthree\n"),
+        (4, 0, 0, "two\nthree\n"),
+        (0, 8, 0, "[8 bytes omitted]\nthree\n"),
+        (0, 0, 2, "[4 bytes omitted]\ntwo\nthree\n"),
+        (100, 0, 0, "one\ntwo\nthree\n"),
+    ],
+)
+def test_tail(tmpdir, offset, max_bytes, max_lines, expected):
+    path = tmpdir.join("driver.log")
+    path.write("one\ntwo\nthree\n")
+    assert tail(str(path), offset, max_bytes, max_lines) == expected
+
+
+class GrowingLog(io.FileIO):
+    # the driver writes to the log after its end has been found
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        position = super(GrowingLog, self).seek(offset, whence)
+        if whence == io.SEEK_END:
+            with open(self.name, "ab") as f:
+                f.write(b"four\n")
+        return position
+
+
+@pytest.mark.parametrize(
+    ("max_lines", "expected"),
+    [(0, "one\ntwo\n"), (1, "[4 bytes omitted]\ntwo\n")],
+)
+def test_tail_while_writing(tmpdir, mocker, max_lines, expected):
+    path = tmpdir.join("driver.log")
+    path.write("one\ntwo\n")
+    opener = SimpleNamespace(
+        open=lambda path, mode: GrowingLog(path), SEEK_END=io.SEEK_END
+    )
+    mocker.patch.object(logs, "io", opener)
+    assert tail(str(path), max_lines=max_lines) == expected
+
+
+def test_compress(tmpdir):
+    path = tmpdir.join("driver.log")
+    path.write("one\ntwo\n")
+    data = b"".join(compress(str(path), offset=4, chunk_size=2))
+    assert gzip.decompress(data) == b"two\n"
+
+
+def test_format_log():
+    log = [entry(1700000000123, "one "), entry(1700000001000.5, "two", "SEVERE")]
+    assert format_log(log) == (
+        "2023-11-14 22:13:20.123000 INFO - one\n"
+        "2023-11-14 22:13:21.000500 SEVERE - two"
+    )
+
+
+def test_iter_log_filters():
+    log = [
+        entry(0, "one"),
+        entry(1, "two", "WARNING"),
+        entry(2, "noise", "SEVERE"),
+        entry(3, "three", "severe"),
+    ]
+    lines = iter_log(log, levels=["warning", "SEVERE"], exclude=re.compile("^noi"))
+    assert [line.split(" - ")[1] for line in lines] == ["two", "three"]
+
+
+def test_log_filters(testdir, driver_class):
+    driver = driver_class.return_value
+    driver.log_types = ["browser"]
+    driver.get_log.return_value = [
+        entry(0, "info"),
+        entry(1, "favicon.ico not found", "SEVERE"),
+        entry(2, "error", "SEVERE"),
+    ]
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_log_levels = SEVERE
+        selenium_log_exclude = favicon
+    """
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        def test_fail(driver):
+            assert False
+    """
+    )
+    reprec = testdir.inline_runqa(file_test)
+    (report,) = [r for r in reprec.getreports("pytest_runtest_logreport") if r.failed]
+    (log,) = [e["content"] for e in report.extras if e["name"] == "Browser Log"]
+    assert log == "1970-01-01 00:00:00.002000 SEVERE - error"
@@ -0,0 +1,141 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+
+import pytest
+
+import pytest_selenium
+from pytest_selenium.profiles import ProfileTemplates
+from pytest_selenium.utils import CaseInsensitiveDict
+
+pytestmark = pytest.mark.nondestructive
+
+
+@pytest.fixture
+def base(tmpdir):
+    base = tmpdir.mkdir("base")
+    base.join("prefs.js").write('user_pref("a", 1);\n')
+    base.join("user.js").write('user_pref("b", 2);\n')
+    base.join("parent.lock").write("")
+    base.mkdir("extensions").join("extension.xpi").write("xpi")
+    return base
+
+
+def test_template(tmpdir, base):
+    profiles = ProfileTemplates(str(tmpdir.join("profiles")), firefox=str(base))
+    template = profiles.template("firefox", {"c": "three"})
+    assert profiles.template("firefox", {"c": "three"}) == template
+    assert profiles.built == 1
+    assert not os.path.exists(os.path.join(template, "parent.lock"))
+    with open(os.path.join(template, "user.js")) as f:
+        assert f.read() == 'user_pref("b", 2);\nuser_pref("c", "three");\n'
+    assert profiles.template("firefox", {"c": "four"}) != template
+    # templates in a shared directory are built once
+    other = ProfileTemplates(str(tmpdir.join("profiles")), firefox=str(base))
+    assert other.template("firefox", {"c": "three"}) == template
+    assert other.built == 0
+
+
+def test_clone(tmpdir, base):
+    profiles = ProfileTemplates(firefox=str(base))
+    template = profiles.template("firefox")
+    path = profiles.clone(template)
+    with open(os.path.join(path, "extensions", "extension.xpi")) as f:
+        assert f.read() == "xpi"
+    with open(os.path.join(path, "prefs.js"), "w") as f:
+        f.write("changed")
+    with open(os.path.join(template, "prefs.js")) as f:
+        assert f.read() == 'user_pref("a", 1);\n'
+    driver = object()
+    profiles.attach(driver, path)
+    profiles.release_driver(driver)
+    assert not os.path.exists(path)
+    profiles.close()
+    assert not os.path.exists(profiles.directory)
+
+
+def test_prepare_remote(tmpdir):
+    profiles = ProfileTemplates(str(tmpdir))
+    kwargs = {"options": object()}
+    assert profiles.prepare("Remote", kwargs) == (kwargs, None)
+
+
+def test_prepare_without_base(tmpdir, base):
+    from selenium.webdriver import ChromeOptions
+
+    profiles = ProfileTemplates(str(tmpdir), firefox=str(base))
+    kwargs = {"options": ChromeOptions()}
+    # a browser without a base profile starts with a new profile
+    assert profiles.prepare("Chrome", kwargs) == (kwargs, None)
+    assert profiles.built == profiles.cloned == 0
+
+
+def test_templates_require_base(testdir, driver_class):
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_profile_templates = true
+    """
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        def test_profile(selenium):
+            pass
+    """
+    )
+    result = testdir.runpytestqa(file_test)
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(
+        ["*PytestConfigWarning: selenium_profile_templates requires *"]
+    )
+    assert "browser profiles cloned" not in result.stdout.str()
+
+
+def test_firefox_profile(testdir, mocker, base):
+    driver_class = mocker.MagicMock()
+    mocker.patch.dict(
+        pytest_selenium.SUPPORTED_DRIVERS,
+        CaseInsensitiveDict({"Firefox": driver_class}),
+    )
+    profile_dir = testdir.tmpdir.join("profiles")
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_profile_templates = true
+        selenium_profile_dir = {0}
+        selenium_firefox_profile = {1}
+    """.format(
+            profile_dir, base
+        )
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        @pytest.mark.firefox_preferences({"browser.startup.page": 0})
+        @pytest.mark.parametrize("i", range(2))
+        def test_profile(selenium, firefox_options, i):
+            assert "browser.startup.page" in firefox_options.preferences
+    """
+    )
+    result = testdir.runpytest(file_test, "--driver", "Firefox")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        ["2 browser profiles cloned from 1 new templates, sharing * files *"]
+    )
+    paths = []
+    for call in driver_class.call_args_list:
+        options = call.kwargs["options"]
+        assert "browser.startup.page" not in options.preferences
+        assert options.arguments[-2] == "-profile"
+        paths.append(options.arguments[-1])
+    assert len(set(paths)) == 2
+    assert not any(os.path.exists(path) for path in paths)
+    (template,) = profile_dir.join("templates").listdir()
+    assert 'user_pref("browser.startup.page", 0);' in template.join("user.js").read()
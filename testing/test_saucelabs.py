@@ -2,13 +2,19 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import configparser
 from functools import partial
 import os
 import json
 
 import pytest
 
-from pytest_selenium.drivers.cloud import Provider
+from pytest_selenium.drivers.cloud import (
+    Provider,
+    clear_settings_cache,
+    close_http_sessions,
+    get_http_session,
+)
 
 pytestmark = [pytest.mark.skip_selenium, pytest.mark.nondestructive]
 
@@ -291,3 +297,37 @@ class Config(object):
             return self._value
         else:
             raise KeyError
+
+
+def test_http_session_shared(mocker):
+    config = mocker.MagicMock()
+    config.getini.side_effect = {
+        "selenium_http_pool_size": "4",
+        "selenium_http_retries": "2",
+    }.get
+    session = get_http_session(config, "SauceLabs")
+    try:
+        assert get_http_session(config, "SauceLabs") is session
+        assert get_http_session(config, "TestingBot") is not session
+        adapter = session.get_adapter("https://saucelabs.com")
+        assert adapter._pool_maxsize == 4
+        assert adapter.max_retries.total == 2
+    finally:
+        close_http_sessions()
+
+
+def test_settings_read_once(monkeypatch, tmpdir, mocker):
+    from pytest_selenium.drivers.saucelabs import SauceLabs
+
+    monkeypatch.setattr(os.path, "expanduser", lambda p: str(tmpdir))
+    tmpdir.join(".saucelabs").write("[credentials]\nusername=foo\nkey=bar")
+    read = mocker.spy(configparser.ConfigParser, "read")
+    clear_settings_cache()
+    for _ in range(3):
+        provider = SauceLabs()
+        assert (provider.username, provider.key) == ("foo", "bar")
+    assert read.call_count == 1
+    tmpdir.join(".saucelabs").write("[credentials]\nusername=baz\nkey=bar")
+    assert SauceLabs().username == "foo"
+    clear_settings_cache()
+    assert SauceLabs().username == "baz"
@@ -0,0 +1,145 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("xdist")
+
+from pytest_selenium.scheduling import DriverScheduling, split_group  # noqa: E402
+
+pytestmark = pytest.mark.nondestructive
+
+
+class MockNode(object):
+    def __init__(self, id):
+        self.gateway = SimpleNamespace(id=id)
+        self.sent = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        pass
+
+
+@pytest.mark.parametrize(
+    ("nodeid", "expected"),
+    [
+        ("test_a.py::test_a@selenium-abc", "selenium-abc"),
+        ("test_a.py::test_a[x@y]@selenium-abc", "selenium-abc"),
+        ("test_a.py::test_a[x@selenium-abc]", None),
+        ("test_a.py::test_a@other", None),
+    ],
+)
+def test_split_group(nodeid, expected):
+    assert split_group(nodeid) == expected
+
+
+@pytest.mark.parametrize(("chunk_size", "scopes"), [(0, 8), (3, 4), (10, 2)])
+def test_groups_are_scheduled_together(testdir, chunk_size, scopes):
+    config = testdir.parseconfig("--tx=2*popen")
+    scheduler = DriverScheduling(config, chunk_size=chunk_size)
+    collection = [
+        "test_a.py::test_{0}@selenium-{1}".format(i, "ab"[i % 2]) for i in range(8)
+    ]
+    nodes = [MockNode("gw0"), MockNode("gw1")]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+    assert len({scheduler._split_scope(nodeid) for nodeid in collection}) == scopes
+    for node in nodes:
+        for index in node.sent:
+            scope = scheduler._split_scope(collection[index])
+            # every test of a scope is sent to the same worker
+            assert all(
+                i in node.sent
+                for i, nodeid in enumerate(collection)
+                if scheduler._split_scope(nodeid) == scope
+            )
+
+
+def test_selenium_dist(testdir):
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_dist_chunk_size = 10
+    """
+    )
+    file_test = testdir.makepyfile(
+        """
+        import os
+        import pytest
+
+        def record(browser):
+            with open(browser + ".txt", "a") as f:
+                f.write(os.environ["PYTEST_XDIST_WORKER"] + "\\n")
+
+        @pytest.mark.nondestructive
+        @pytest.mark.capabilities(browserName="chrome")
+        @pytest.mark.parametrize("i", range(4))
+        def test_chrome(i):
+            record("chrome")
+
+        @pytest.mark.nondestructive
+        @pytest.mark.capabilities(browserName="edge")
+        @pytest.mark.parametrize("i", range(4))
+        def test_edge(i):
+            record("edge")
+    """
+    )
+    result = testdir.runpytestqa("-n", "2", "--selenium-dist", file_test)
+    result.assert_outcomes(passed=8)
+    for browser in ("chrome", "edge"):
+        workers = testdir.tmpdir.join(browser + ".txt").read().split()
+        assert len(workers) == 4
+        assert len(set(workers)) == 1
+
+
+def test_selenium_dist_keeps_node_ids(testdir, monkeypatch):
+    monkeypatch.setenv("SAUCELABS_USERNAME", "foo")
+    monkeypatch.setenv("SAUCELABS_API_KEY", "bar")
+    testdir.makeconftest(
+        """
+        import pytest
+
+        from pytest_selenium.artifacts import artifact_name
+
+        @pytest.hookimpl(hookwrapper=True)
+        def pytest_runtest_makereport(item, call):
+            outcome = yield
+            report = outcome.get_result()
+            if report.when == "call":
+                with open("names.txt", "a") as f:
+                    name = artifact_name(item, report, "screenshot", "png")
+                    f.write("{0} {1}\\n".format(report.nodeid, name))
+    """
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        @pytest.mark.parametrize("i", range(4))
+        def test_job(driver_kwargs, i):
+            with open("names.txt", "a") as f:
+                f.write(driver_kwargs["options"].capabilities["name"] + "\\n")
+    """
+    )
+    names = []
+    for args in ([], ["--selenium-dist"]):
+        testdir.tmpdir.join("names.txt").write("")
+        result = testdir.runpytest(
+            "-n", "2", "--driver", "saucelabs", "--junitxml=junit.xml", file_test, *args
+        )
+        result.assert_outcomes(passed=4)
+        # job, test, and artifact names, and reports do not include the group
+        names.append(sorted(testdir.tmpdir.join("names.txt").read().splitlines()))
+        assert "@" not in testdir.tmpdir.join("junit.xml").read()
+        assert "@" not in result.stdout.str()
+    assert len(names[0]) == 8
+    assert names[0] == names[1]
@@ -0,0 +1,142 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import json
+import os
+
+import pytest
+
+from pytest_selenium.pool import clone_driver_kwargs
+from pytest_selenium.services import SharedService, SharedServices, get_service
+
+pytestmark = pytest.mark.nondestructive
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFTEST = """
+import json
+import sys
+
+import pytest
+from selenium.webdriver import Remote
+from selenium.webdriver.common.service import Service
+
+from pytest_selenium.services import get_service
+
+# run a fake driver service, logging each command
+SCRIPT = '''
+import sys
+sys.path.insert(0, {root!r})
+from testing.fake_webdriver import FakeWebDriver
+
+class LoggingWebDriver(FakeWebDriver):
+    def handle(self, method, path, body):
+        print(method, path, flush=True)
+        return super().handle(method, path, body)
+
+LoggingWebDriver(port=int(sys.argv[1])).start()._thread.join()
+'''
+
+
+class FakeService(Service):
+    def command_line_args(self):
+        return ["-c", SCRIPT, str(self.port)]
+
+
+class LocalDriver(Remote):
+    # start and stop the service like the local drivers of selenium
+
+    def __init__(self, options=None, service=None):
+        self.service = service
+        service.path = sys.executable
+        service.start()
+        super().__init__(command_executor=service.service_url, options=options)
+
+    def quit(self):
+        try:
+            super().quit()
+        except Exception:
+            pass
+        finally:
+            self.service.stop()
+
+
+@pytest.fixture(scope="session")
+def driver_class():
+    return LocalDriver
+
+
+@pytest.fixture
+def chrome_service(pytestconfig, driver_log):
+    return get_service(pytestconfig, FakeService, log_output=driver_log)
+
+
+def pytest_runtest_logreport(report):
+    if report.when == "call":
+        logs = [e["content"] for e in report.extras if e["name"] == "Driver Log"]
+        with open(report.nodeid.split("::")[-1] + ".json", "w") as f:
+            json.dump(logs, f)
+"""
+
+
+class Service(object):
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+def test_get_service(tmpdir):
+    config = type("Config", (object,), {})()
+    assert isinstance(get_service(config, Service, log_output="log"), Service)
+    config._selenium_services = SharedServices()
+    service = get_service(config, Service, service_args=["-v"], log_output="log")
+    assert isinstance(service, SharedService)
+    # the log is shared by every session of the service
+    assert service.kwargs["log_output"] != "log"
+    same = get_service(config, Service, service_args=["-v"], log_output="other")
+    assert same.kwargs is service.kwargs
+    assert get_service(config, Service).kwargs is not service.kwargs
+    clone = clone_driver_kwargs({"service": service})["service"]
+    assert clone is not service and clone.kwargs is service.kwargs
+    config._selenium_services.close()
+    assert not os.path.exists(config._selenium_services.directory)
+
+
+def test_shared_service(testdir):
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_shared_services = true
+        selenium_capture_debug = always
+        selenium_exclude_debug = url:screenshot:html
+    """
+    )
+    testdir.makeconftest(CONFTEST.format(root=ROOT))
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        def test_first(selenium):
+            selenium.get("http://www.example.com")
+
+        @pytest.mark.nondestructive
+        def test_crash(selenium):
+            selenium.service.process.kill()
+            selenium.service.process.wait()
+
+        @pytest.mark.nondestructive
+        def test_after_crash(selenium):
+            selenium.get("http://www.example.com")
+    """
+    )
+    result = testdir.runpytest(file_test, "--driver", "Chrome")
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(
+        ["3 sessions shared 2 driver service processes, restarting 1 of them"]
+    )
+    for name in ("test_first", "test_crash", "test_after_crash"):
+        with open(str(testdir.tmpdir.join(name + ".json"))) as f:
+            (log,) = json.load(f)
+        # each test only includes the log of its own session
+        assert log.count("POST /session\n") == 1
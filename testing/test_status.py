@@ -0,0 +1,75 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+
+from pytest_selenium.status import StatusSync
+
+pytestmark = pytest.mark.nondestructive
+
+
+def record(sync, sent, job, phase, passed, is_failed=lambda: False):
+    sync.update(
+        job,
+        "Provider",
+        not passed,
+        lambda: sent.append((job, passed)),
+        is_failed,
+        overwrite=phase == "setup",
+    )
+
+
+@pytest.mark.parametrize("mode", ["background", "session"])
+def test_never_overwrite_failure(mode):
+    sync, sent = StatusSync(mode), []
+    record(sync, sent, "job", "setup", True)
+    record(sync, sent, "job", "call", False)
+    record(sync, sent, "job", "teardown", True)
+    assert sync.flush() == []
+    assert sent[-1] == ("job", False)
+    assert ("job", True) not in sent[sent.index(("job", False)) :]
+
+
+def test_session_sends_once_per_job():
+    sync, sent = StatusSync("session", workers=4), []
+    for job in ("one", "two"):
+        record(sync, sent, job, "setup", True)
+        record(sync, sent, job, "call", True)
+        record(sync, sent, job, "teardown", True)
+    assert sent == []
+    assert sync.flush() == []
+    assert sorted(sent) == [("one", True), ("two", True)]
+    assert sync.sent == 2
+
+
+def test_setup_overwrites_failure():
+    sync, sent = StatusSync("session"), []
+    record(sync, sent, "job", "call", False)
+    record(sync, sent, "job", "setup", True)
+    sync.flush()
+    assert sent == [("job", True)]
+
+
+def test_provider_failure_is_checked_when_unknown():
+    sync, sent = StatusSync("session"), []
+    record(sync, sent, "job", "call", True, is_failed=lambda: True)
+    sync.flush()
+    assert sent == []
+    record(sync, sent, "job", "teardown", True)
+    assert sent == []
+
+
+def test_errors():
+    def send():
+        raise Exception("Service unavailable")
+
+    sync = StatusSync("session")
+    sync.update("job", "Provider", False, send, lambda: False, overwrite=True)
+    assert sync.flush() == ["Failed to update Provider job status: Service unavailable"]
+    assert sync.sent == 0
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        StatusSync("immediate")
@@ -0,0 +1,52 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+
+from pytest_selenium.teardown import AsyncQuitter
+
+pytestmark = pytest.mark.nondestructive
+
+
+def test_async_quit(testdir, driver_class):
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_quit_workers = 2
+    """
+    )
+    driver_class.return_value.quit.side_effect = [None, Exception("Session gone")]
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        def test_one(driver):
+            assert driver
+
+        @pytest.mark.nondestructive
+        def test_two(driver):
+            assert driver
+    """
+    )
+    result = testdir.runpytestqa(file_test)
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        [
+            "1 drivers quit in the background",
+            "WARNING: Failed to quit driver: Session gone",
+        ]
+    )
+    assert driver_class.return_value.quit.call_count == 2
+
+
+def test_async_quit_drain(mocker):
+    quitter = AsyncQuitter(workers=1, max_pending=1)
+    drivers = [mocker.MagicMock() for _ in range(3)]
+    for driver in drivers:
+        quitter.quit(driver)
+    assert quitter.drain() == []
+    assert quitter.quits == 3
+    for driver in drivers:
+        driver.quit.assert_called_once_with()
@@ -0,0 +1,97 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import json
+
+import pytest
+
+import pytest_selenium
+from pytest_selenium import timing
+
+pytestmark = pytest.mark.nondestructive
+
+
+def test_summarize():
+    summary = timing.summarize({"phase": [float(i) for i in range(100, 0, -1)]})
+    assert summary["phase"] == {
+        "count": 100,
+        "total": 5050.0,
+        "mean": 50.5,
+        "p50": 50.0,
+        "p90": 90.0,
+        "p99": 99.0,
+        "max": 100.0,
+    }
+
+
+def test_record_disabled(testdir):
+    config = testdir.parseconfig()
+    properties = []
+    timing.record(config, "phase", 1.0, properties)
+    assert properties == []
+    assert "timings" not in pytest_selenium.stats.get_stats(config)
+
+
+def test_timings(testdir, driver_class):
+    path = testdir.tmpdir.join("timings.json")
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_timings = true
+        selenium_timings_json = {0}
+    """.format(
+            path
+        )
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        def test_timings(selenium):
+            assert False
+    """
+    )
+    reprec = testdir.inline_runqa(file_test)
+    setup, call, teardown = reprec.getreports("pytest_runtest_logreport")
+    names = [name for name, value in call.user_properties]
+    assert "selenium_timing_driver_init" in names
+    assert "selenium_timing_gather_url" in names
+    assert "selenium_timing_gather_screenshot" in names
+    assert "selenium_timing_driver_quit" in dict(teardown.user_properties)
+    phases = json.loads(path.read())["phases"]
+    for name in ("driver_init", "driver_quit", "gather_url", "gather_html"):
+        assert phases[name]["count"] == 1
+        assert phases[name]["samples"] == [phases[name]["total"]]
+
+
+def test_timings_summary(testdir, driver_class):
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_timings = true
+    """
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        def test_one(selenium):
+            pass
+
+        @pytest.mark.nondestructive
+        def test_two(selenium):
+            pass
+    """
+    )
+    result = testdir.runpytestqa(file_test)
+    result.assert_outcomes(passed=2)
+    result.stdout.re_match_lines(
+        [
+            r"phase +count +total +mean +p50 +p90 +p99 +max",
+            r"driver_init +2 .*s$",
+            r"driver_quit +2 .*s$",
+        ]
+    )
@@ -0,0 +1,79 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import json
+
+import pytest
+
+from pytest_selenium.tracing import CommandTracer
+
+pytestmark = pytest.mark.nondestructive
+
+
+class Driver(object):
+    def execute(self, driver_command, params=None):
+        return {"value": "x" * 10}
+
+
+def test_tracer_records_commands():
+    driver = Driver()
+    tracer = CommandTracer(driver)
+    assert driver.execute("findElement", {"using": "id"}) == {"value": "x" * 10}
+    (event,) = tracer.events
+    assert event["name"] == "findElement"
+    assert event["ph"] == "X"
+    assert event["args"] == {"params_bytes": 15, "result_bytes": 12}
+    tracer.detach()
+    driver.execute("findElement")
+    assert len(tracer.events) == 1
+
+
+def test_tracer_records_failed_commands():
+    driver = Driver()
+    driver.execute = lambda *args: 1 / 0
+    tracer = CommandTracer(driver)
+    with pytest.raises(ZeroDivisionError):
+        driver.execute("click")
+    assert tracer.events[0]["args"]["result_bytes"] == 0
+    tracer.detach()
+    with pytest.raises(ZeroDivisionError):
+        driver.execute("click")
+    assert len(tracer.events) == 1
+
+
+def test_trace(testdir, driver_class):
+    driver_class.return_value.execute.return_value = {"value": None}
+    trace_dir = testdir.tmpdir.join("traces")
+    testdir.makeini(
+        """
+        [pytest]
+        selenium_trace_dir = {0}
+    """.format(
+            trace_dir
+        )
+    )
+    file_test = testdir.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.nondestructive
+        def test_trace(selenium):
+            for _ in range(3):
+                selenium.execute("findElement", {"using": "css selector"})
+            selenium.execute("get", {"url": "http://www.example.com"})
+    """
+    )
+    result = testdir.runpytestqa(file_test)
+    result.assert_outcomes(passed=1)
+    result.stdout.re_match_lines(
+        [
+            r"Slowest WebDriver commands in total:",
+            r" +\d+\.\d{3}s +3 findElement",
+            r"Slowest WebDriver commands:",
+        ]
+    )
+    (trace,) = trace_dir.listdir()
+    assert trace.basename == "test_trace.py_test_trace.trace.json"
+    events = json.loads(trace.read())["traceEvents"]
+    assert [event["name"] for event in events] == ["findElement"] * 3 + ["get"]